@@ -0,0 +1,4 @@
+import time
+
+# Reference point for startup timing: this package is the first part of the app the server imports
+STARTED_AT = time.perf_counter()
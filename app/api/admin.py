@@ -1,39 +1,69 @@
 from typing import List
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.user import User, UserCreate, UserResponse
-from app.services.user_service import send_admin_reset_password_email, set_admin_password, get_admin_by_email, create_admin, delete_admin_by_email
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_session, run_db
+from app.models.user import AdminStatsResponse, MessageResponse, User, UserCreate, UserResponse
+from app.services.user_service import (
+    list_admins,
+    list_admins_async,
+    get_admin_by_email,
+    get_admin_by_email_async,
+    create_admin,
+    create_admin_async,
+    delete_admin_by_email,
+    delete_admin_by_email_async,
+)
 from app.core.config import logger
+from app.core.auth_user_cache import auth_user_cache
+from app.core.password_hasher import password_hasher
 from app.core.security import require_superadmin
+from app.core.session_bus import session_bus
+from app.core.session_cache import session_cache
+from app.core.startup import startup
+from app.services.outbox_service import outbox_stats
+from app.services.search_index import user_search_index
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 @router.get("/", response_model=List[UserResponse], summary="Get all admins")
 @require_superadmin
-def get_all_admins(request: Request, db: Session = Depends(get_db)):
-    admins = db.query(User).all()
+async def get_all_admins(request: Request, db: Session = Depends(get_session)):
+    admins = await run_db(list_admins, list_admins_async, db)
     if not admins:
         logger.warning("No admins found")
         raise HTTPException(status_code=404, detail="No admins found")
     return admins
 
+@router.get("/stats", response_model=AdminStatsResponse, summary="Get in-process cache, index, password hashing, email outbox and startup statistics")
+@require_superadmin
+async def get_stats(request: Request):
+    return {
+        "session_cache": session_cache.stats(),
+        "session_bus": session_bus.stats(),
+        "auth_user_cache": auth_user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "search_index": user_search_index.stats(),
+        "email_outbox": await run_in_threadpool(outbox_stats),
+        "startup": startup.stats(),
+    }
+
 @router.post("/", response_model=UserResponse, summary="Create a new dashboard admin")
 @require_superadmin
-def add_admin(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_admin = get_admin_by_email(db, user_data.email)
+async def add_admin(request: Request, user_data: UserCreate, db: Session = Depends(get_session)):
+    existing_admin = await run_db(get_admin_by_email, get_admin_by_email_async, db, user_data.email)
     if existing_admin:
         logger.warning(f"Admin already exists: {user_data.email}")
         raise HTTPException(status_code=400, detail="Admin already exists")
 
-    new_admin = create_admin(db, user_data)
+    new_admin = await run_db(create_admin, create_admin_async, db, user_data)
     return new_admin
 
-@router.delete("/{email}", summary="Delete an admin by email")
+@router.delete("/{email}", response_model=MessageResponse, summary="Delete an admin by email")
 @require_superadmin
-def remove_admin(request: Request, email: str, db: Session = Depends(get_db)):
+async def remove_admin(request: Request, email: str, db: Session = Depends(get_session)):
     try:
-        response = delete_admin_by_email(db, email)
+        response = await run_db(delete_admin_by_email, delete_admin_by_email_async, db, email)
         return response
     except ValueError as e:
         logger.error(f"Failed to delete admin: {email} - {str(e)}")
@@ -1,15 +1,24 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_session, run_db
 from app.models.user import User, UserLogin, TokenResponse, UserResponse
-from app.services.auth_service import authenticate_admin, generate_admin_access_token, save_session_token
-from app.services.user_service import send_admin_reset_password_email, set_admin_password
+from app.services.auth_service import (
+    authenticate_admin,
+    generate_admin_access_token,
+    save_session_token,
+    save_session_token_async,
+)
+from app.services.user_service import (
+    send_admin_reset_password_email,
+    send_admin_reset_password_email_async,
+    set_admin_password,
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/login", response_model=TokenResponse, summary="Admin login to get an access token")
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    admin = authenticate_admin(db, user_data.email, user_data.password)
+async def login(user_data: UserLogin, db: Session = Depends(get_session)):
+    admin = await authenticate_admin(db, user_data.email, user_data.password)
     
     if not admin:
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -17,7 +26,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     access_token = generate_admin_access_token(admin)
     
     # Save the session token in the database
-    if not save_session_token(db, admin, access_token):
+    if not await run_db(save_session_token, save_session_token_async, db, admin, access_token):
         raise HTTPException(status_code=500, detail="Failed to save session token")
 
     return {"access_token": access_token, "token_type": "bearer"}
@@ -28,16 +37,16 @@ async def get_current_admin(request: Request):
     return request.state.user
 
 @router.post("/reset-password", summary="Set password for an admin using a token")
-def set_admin_password_endpoint(
-    db: Session = Depends(get_db),
+async def set_admin_password_endpoint(
+    db: Session = Depends(get_session),
     token: str = Body(...),
     new_password: str = Body(...)
 ):
-    return set_admin_password(db, token, new_password)
+    return await set_admin_password(db, token, new_password)
 
 @router.post("/reset-password/request", summary="Request password reset")
-def request_password_reset(
+async def request_password_reset(
     data: dict = Body(...), 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
-    return send_admin_reset_password_email(db, data["email"])
+    return await run_db(send_admin_reset_password_email, send_admin_reset_password_email_async, db, data["email"])
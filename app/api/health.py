@@ -0,0 +1,32 @@
+import secrets
+from fastapi import APIRouter, HTTPException, Request, Response
+from app.core.config import settings
+from app.core.health import check_readiness
+from app.core.metrics import render_metrics
+from app.models.health import HealthResponse, ReadinessResponse
+
+router = APIRouter(tags=["Health"])
+
+# Liveness: answers as long as the event loop does, without touching any backend
+@router.get("/healthz", response_model=HealthResponse, summary="Liveness probe")
+async def healthz():
+    return {"status": "ok"}
+
+# Readiness: backends initialized and reachable, from probe results cached for a few seconds
+@router.get("/readyz", response_model=ReadinessResponse, summary="Readiness probe")
+async def readyz(response: Response):
+    ready, body = await check_readiness()
+    if not ready:
+        response.status_code = 503
+    return body
+
+# Prometheus scrape target; per-process, with bounded labels. Needs the METRICS_TOKEN bearer token
+@router.get("/metrics", response_class=Response, summary="Prometheus metrics")
+async def metrics(request: Request):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not secrets.compare_digest(request.headers.get("Authorization", "").encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
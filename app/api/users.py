@@ -1,102 +1,249 @@
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, Body, Request
+from typing import Annotated, List, Optional, Union
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Body, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 from app.services.user_service import (
     list_users,
     create_user_in_firebase,
+    create_users_in_firebase_bulk,
+    parse_users_csv,
+    summarize_bulk_create,
+    set_users_status_bulk,
+    delete_users_in_firebase_bulk,
     get_user_by_email,
-    get_user_by_uid,
+    get_user_by_uid_with_version,
+    get_users_batch,
+    search_users,
+    export_users,
     update_user_in_firebase,
     delete_user_in_firebase,
     approve_user,
     hold_user,
     generate_password_reset_link
 )
-from app.models.firebase_user import FirebaseUser
+from app.models.firebase_user import (
+    MAX_BULK_CREATE,
+    MAX_BULK_CSV_BYTES,
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkActionResponse,
+    BulkSelectionRequest,
+    BulkStatusRequest,
+    BulkCreateResponse,
+    FirebaseUser,
+    PasswordResetLinkResponse,
+    UserCreatedResponse,
+    UserListResponse,
+    UserLookupResponse,
+    UserSearchResponse,
+)
+from app.models.user import MessageResponse
+from app.core.http_cache import etag_matches, not_modified, set_cache_headers, weak_etag
 from app.core.security import  require_superadmin
+from app.services.search_index import user_search_index
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 # Get paginated users
-@router.get("/", summary="Get paginated users from Firestore")
-def get_users(
+# Left to right: trying the lookup model first would run email validation on every listed row
+@router.get("/", response_model=Annotated[Union[UserListResponse, UserLookupResponse], Field(union_mode="left_to_right")], summary="Get paginated users from Firestore")
+async def get_users(
+    request: Request,
+    response: Response,
     limit: int = Query(10, ge=1, le=100, description="Number of users per page"),
     last_uid: str = Query(None, description="UID of the last user from the previous page for pagination"),
+    cursor: str = Query(None, description="Opaque next_cursor or prev_cursor from a previous page"),
     status: str = Query(None, regex="^(active|on_hold|all)$", description="Filter users by status (active or on_hold)"),
     email: str = Query(None, regex=r"(^$|^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$)", description="User's email address"),
 ):
     try:
         if email:
-            user = get_user_by_email(email)
+            user = await get_user_by_email(email)
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
             return user
         else:
-            return list_users(limit=limit, last_uid=last_uid, status=status)
+            # While the listener tracks the collection, a revalidation is answered without any read
+            version = user_search_index.collection_version()
+            etag = weak_etag("users", version, limit, last_uid, cursor, status) if version else None
+            if etag and etag_matches(request, etag):
+                return not_modified(etag)
+
+            users_data = await list_users(limit=limit, last_uid=last_uid, status=status, cursor=cursor)
+            etag = etag or weak_etag("users", users_data)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            set_cache_headers(response, etag)
+            return users_data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Get user by email
-@router.get("/email/{email}", summary="Get user details by email")
-def get_user(email: str):
-    user = get_user_by_email(email)
+@router.get("/email/{email}", response_model=UserLookupResponse, summary="Get user details by email")
+async def get_user(email: str):
+    user = await get_user_by_email(email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-@router.get("/{user_id}", summary="Get user details by UID")
-def get_user_by_uid_endpoint(user_id: str):
-    user = get_user_by_uid(user_id)
+# Get many users by UID or email
+@router.post("/batch-get", response_model=BatchGetResponse, summary="Get many users by UID or email")
+async def batch_get_users(request_data: BatchGetRequest):
+    try:
+        return await get_users_batch(request_data.uids, request_data.emails)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error fetching users")
+
+# Search users by name, practice name, NPI or email prefix
+@router.get("/search", response_model=UserSearchResponse, summary="Search users by name, practice name, NPI or email")
+async def search_users_endpoint(
+    q: str = Query(..., min_length=2, max_length=200, description="Words matched as prefixes of name, practice name, NPI or email"),
+    status: str = Query(None, regex="^(active|on_hold|all)$", description="Filter users by status (active or on_hold)"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of users returned"),
+):
+    return search_users(q, status=status, limit=limit)
+
+# Export users
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+@router.get("/export", response_class=StreamingResponse, summary="Stream all users as CSV or NDJSON")
+async def export_users_endpoint(
+    format: str = Query("csv", regex="^(csv|ndjson)$", description="Export format"),
+    status: str = Query(None, regex="^(active|on_hold)$", description="Filter users by status (active or on_hold)"),
+):
+    filename = f"users-{status or 'all'}-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export_users(format, status=status),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+def _user_etag(user_id: str, update_time) -> str:
+    return weak_etag("user", user_id, update_time.isoformat())
+
+@router.get("/{user_id}", response_model=FirebaseUser, summary="Get user details by UID")
+async def get_user_by_uid_endpoint(user_id: str, request: Request, response: Response):
+    # Version kept current by the listener: a matching revalidation skips the Firestore read
+    known_version = user_search_index.document_version(user_id)
+    if known_version is not None and etag_matches(request, etag := _user_etag(user_id, known_version)):
+        return not_modified(etag)
+
+    collection_version = user_search_index.collection_version()
+    user, update_time = await get_user_by_uid_with_version(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if collection_version:
+        user_search_index.record_document_version(user_id, update_time, collection_version)
+    etag = _user_etag(user_id, update_time)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
     return user
 
 # Create user
-@router.post("/", summary="Create a new Firebase user")
-def create_user(user_data: FirebaseUser):
+@router.post("/", response_model=UserCreatedResponse, summary="Create a new Firebase user")
+async def create_user(user_data: FirebaseUser):
     try:
-        user_id = create_user_in_firebase(user_data)
+        user_id = await create_user_in_firebase(user_data)
         return {"user_id": user_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error creating user")
 
+# Bulk create users from JSON
+@router.post("/bulk", response_model=BulkCreateResponse, summary="Create many Firebase users")
+async def create_users_bulk(users: List[FirebaseUser] = Body(..., max_length=MAX_BULK_CREATE)):
+    results = await create_users_in_firebase_bulk(list(enumerate(users)))
+    return summarize_bulk_create(results)
+
+# Bulk create users from a CSV roster sent as the request body (Content-Type: text/csv)
+@router.post("/bulk/csv", response_model=BulkCreateResponse, summary="Create many Firebase users from a CSV roster")
+async def create_users_bulk_csv(request: Request):
+    too_large = HTTPException(status_code=413, detail=f"CSV uploads are limited to {MAX_BULK_CSV_BYTES} bytes")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_BULK_CSV_BYTES:
+        raise too_large
+
+    # Chunked uploads carry no Content-Length, so the cap is also enforced while reading
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > MAX_BULK_CSV_BYTES:
+            raise too_large
+
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+    users, failures = parse_users_csv(content)
+    if len(users) + len(failures) > MAX_BULK_CREATE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_CREATE} rows per upload")
+
+    results = await create_users_in_firebase_bulk(users)
+    return summarize_bulk_create(results + failures)
+
+# Bulk approve or hold users
+@router.post("/bulk/status", response_model=BulkActionResponse, summary="Approve or hold many users")
+async def bulk_status(request_data: BulkStatusRequest):
+    try:
+        return await set_users_status_bulk(request_data.uids, request_data.filter, request_data.action)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error updating users")
+
+# Bulk delete users
+@router.post("/bulk/delete", response_model=BulkActionResponse, summary="Delete many users from Firebase")
+@require_superadmin
+async def bulk_delete(request: Request, request_data: BulkSelectionRequest):
+    try:
+        return await delete_users_in_firebase_bulk(request_data.uids, request_data.filter)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error deleting users")
+
 # Update user
-@router.put("/{user_id}", summary="Update user details")
-def update_user(user_id: str, update_data: dict = Body(...)):
+@router.put("/{user_id}", response_model=FirebaseUser, summary="Update user details")
+async def update_user(user_id: str, update_data: dict = Body(...)):
     try:
-        updated_user = update_user_in_firebase(user_id, update_data)
+        updated_user = await update_user_in_firebase(user_id, update_data)
         return updated_user
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error updating user")
 
 # Delete user
-@router.delete("/{user_id}", summary="Delete a user from Firebase")
+@router.delete("/{user_id}", response_model=MessageResponse, summary="Delete a user from Firebase")
 @require_superadmin
-def delete_user(request: Request, user_id: str):
+async def delete_user(request: Request, user_id: str):
     try:
-        return delete_user_in_firebase(user_id)
+        return await delete_user_in_firebase(user_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error deleting user")
 
 # Approve user
-@router.post("/{user_id}/approve", summary="Approve and enable user")
-def approve(user_id: str):
+@router.post("/{user_id}/approve", response_model=MessageResponse, summary="Approve and enable user")
+async def approve(user_id: str):
     try:
-        return approve_user(user_id)
+        return await approve_user(user_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error approving user")
 
 # Put user on hold
-@router.post("/{user_id}/hold", summary="Put user on hold")
-def hold(user_id: str):
+@router.post("/{user_id}/hold", response_model=MessageResponse, summary="Put user on hold")
+async def hold(user_id: str):
     try:
-        return hold_user(user_id)
+        return await hold_user(user_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error putting user on hold")
 
 # Generate password reset link
-@router.post("/password-reset", summary="Generate password reset link")
-def reset_password(email: str = Body(..., embed=True)):
+@router.post("/password-reset", response_model=PasswordResetLinkResponse, summary="Generate password reset link")
+async def reset_password(email: str = Body(..., embed=True)):
     try:
-        return {"reset_link": generate_password_reset_link(email)}
+        return {"reset_link": await generate_password_reset_link(email)}
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error generating password reset link")
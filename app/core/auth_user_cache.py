@@ -0,0 +1,114 @@
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class _CachedRecord:
+    record: object
+    email_key: str | None
+    fetched_at: float
+
+
+class AuthUserCache:
+    """
+    Bounded TTL/LRU cache of Firebase Auth UserRecords, reachable by uid and by email.
+    Changes made through this service invalidate entries; changes made elsewhere (the
+    Firebase console, the provider app) are picked up once the TTL passes.
+
+    Every invalidation bumps a generation. A lookup captures it before calling Auth, and `put`
+    drops the record if it changed meanwhile, so a read that raced approve, hold or delete cannot
+    cache the old record. The generation is cache-wide since email lookups learn the uid only
+    from their result; a lookup overlapping any invalidation is just not cached.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._by_uid = TTLCache(maxsize=maxsize, ttl=ttl_seconds, timer=time.monotonic)
+        self._uid_by_email = TTLCache(maxsize=maxsize, ttl=ttl_seconds, timer=time.monotonic)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._served_ages = deque(maxlen=1024)
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, uid: str | None):
+        entry = self._by_uid.get(uid) if uid else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._served_ages.append(time.monotonic() - entry.fetched_at)
+        return entry.record
+
+    def get_by_uid(self, uid: str):
+        with self._lock:
+            return self._lookup(uid)
+
+    def get_by_email(self, email: str):
+        with self._lock:
+            return self._lookup(self._uid_by_email.get(email.lower()))
+
+    def generation(self) -> int:
+        """Current generation; capture it before calling Auth and pass it to `put`."""
+        with self._lock:
+            return self._generation
+
+    def put(self, record, generation: int) -> None:
+        """Caches a fetched record, unless an invalidation happened since `generation` was captured."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._drop(record.uid)
+            email_key = record.email.lower() if record.email else None
+            self._by_uid[record.uid] = _CachedRecord(record=record, email_key=email_key, fetched_at=time.monotonic())
+            if email_key:
+                self._uid_by_email[email_key] = record.uid
+
+    def _drop(self, uid: str) -> None:
+        entry = self._by_uid.pop(uid, None)
+        if entry and entry.email_key:
+            self._uid_by_email.pop(entry.email_key, None)
+
+    def invalidate(self, *uids: str) -> None:
+        """Drops the cached records of the given users, under both their uid and email."""
+        with self._lock:
+            self._generation += 1
+            for uid in uids:
+                self._drop(uid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._by_uid.clear()
+            self._uid_by_email.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._by_uid.expire()
+            lookups = self.hits + self.misses
+            ages = sorted(self._served_ages)
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._by_uid),
+                "maxsize": self._by_uid.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                # Age of the records served from cache, i.e. how stale hits were
+                "served_age_seconds_p50": round(statistics.median(ages), 3) if ages else 0.0,
+                "served_age_seconds_max": round(ages[-1], 3) if ages else 0.0,
+            }
+
+
+# Shared per-process Auth user cache
+auth_user_cache = AuthUserCache(
+    maxsize=settings.AUTH_USER_CACHE_MAXSIZE,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
@@ -1,22 +1,58 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 import os
 from app.core.config import settings, logger  # Import logger from config
-from contextlib import contextmanager
+from app.core.metrics import instrument_pool
+from app.core.timing import request_span
+from contextlib import asynccontextmanager, contextmanager
 
 # Use environment variable for database URL
 DATABASE_URL = settings.DATABASE_URL
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set")
 
+# Async drivers for the sync dialects we support
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(database_url: str):
+    """Translates a sync DATABASE_URL to its async driver equivalent."""
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    if url.drivername == "postgresql+asyncpg":
+        # asyncpg takes `ssl` instead of libpq's `sslmode` and has no channel binding option
+        query = dict(url.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        url = url.set(query=query)
+    return url
+
 # Initialize the database connection
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_pool(engine, "sync")
 Base = declarative_base()
 
+# Opt-in async engine, selected with DB_ASYNC
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(to_async_url(DATABASE_URL), pool_pre_ping=True)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    instrument_pool(async_engine.sync_engine, "async")
+    logger.info("⚡ Async database mode enabled.")
+
 def init_db():
     """Initialize database and create tables if they don't exist."""
     from app.models.user import Base  # Ensure models are loaded
+    import app.models.email_outbox  # noqa: F401  Registers the email_outbox table
     Base.metadata.create_all(bind=engine)
     logger.info("✅ Successfully connected to PostgreSQL and initialized database.")
 
@@ -28,7 +64,7 @@ def get_db():
         yield db
     finally:
         db.close()
-        
+
 @contextmanager
 def get_db_context():
     """Dependency to get a database session."""
@@ -36,4 +72,43 @@ def get_db_context():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def get_async_db_context():
+    """Context manager to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session dependency for the admin routes, following DB_ASYNC
+get_session = get_async_db if settings.DB_ASYNC else get_db
+
+async def run_db(sync_fn, async_fn, db, *args, **kwargs):
+    """Runs `async_fn` on an AsyncSession, or `sync_fn` in the threadpool on a sync Session."""
+    with request_span("db"):
+        if isinstance(db, AsyncSession):
+            return await async_fn(db, *args, **kwargs)
+        return await run_in_threadpool(sync_fn, db, *args, **kwargs)
+
+def ping_db():
+    """Readiness probe: one round trip on a pooled connection."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+async def ping_db_async():
+    """Readiness probe on the async engine when DB_ASYNC is set, otherwise in the threadpool."""
+    if async_engine is None:
+        return await run_in_threadpool(ping_db)
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+async def dispose_engines():
+    """Closes pooled connections on shutdown."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    await run_in_threadpool(engine.dispose)
@@ -1,118 +1,357 @@
+import asyncio
+import functools
 import json
-import firebase_admin
-from firebase_admin import credentials, auth, firestore
 import os
+import threading
+from starlette.concurrency import run_in_threadpool
+from app.core.auth_user_cache import auth_user_cache
 from app.core.config import settings, logger
+from app.core.metrics import FIREBASE_CALL_ERRORS, FIREBASE_CALL_SECONDS, firebase_call, instrument
+from app.core.timing import request_span
+from app.models.firebase_user import USER_LIST_FIELDS, UserListRow
 
-# Load Firebase credentials from environment variables
-FIREBASE_CREDENTIALS = settings.FIREBASE_CREDENTIALS
+# firebase_admin and the Firestore gRPC stack take about half a second to import, so
+# they are imported on first use. The lifespan warms them up in a worker thread; a
+# request arriving before that finishes initializes them itself.
 
-# Initialize Firebase only once
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_CREDENTIALS)
-    firebase_admin.initialize_app(cred)
-    logger.info("✅ Successfully connected to Firebase.")
+_init_lock = threading.RLock()
+_firebase_auth = None
+_firestore_client = None
 
-# Singleton Firestore Client
-_firestore_client = firestore.client()
-logger.info("✅ Firestore client initialized.")
+def init_firebase():
+    """Initializes the Firebase app once and returns the firebase_admin.auth module."""
+    global _firebase_auth
+    if _firebase_auth is None:
+        with _init_lock:
+            if _firebase_auth is None:
+                import firebase_admin
+                from firebase_admin import auth, credentials
+                if not firebase_admin._apps:
+                    firebase_admin.initialize_app(credentials.Certificate(settings.FIREBASE_CREDENTIALS))
+                    logger.info("✅ Successfully connected to Firebase.")
+                _firebase_auth = auth
+    return _firebase_auth
+
+def init_firestore():
+    """Creates the shared Firestore client once and preloads the async client's gRPC stack."""
+    global _firestore_client
+    if _firestore_client is None:
+        with _init_lock:
+            if _firestore_client is None:
+                init_firebase()
+                from firebase_admin import firestore, firestore_async  # noqa: F401
+                _firestore_client = firestore.client()
+                logger.info("✅ Firestore client initialized.")
+    return _firestore_client
+
+def get_firebase_auth():
+    """Returns the firebase_admin.auth module, initializing Firebase on first use."""
+    return _firebase_auth or init_firebase()
 
 def get_firestore_client():
     """Returns a shared Firestore client instance."""
-    return _firestore_client
+    return _firestore_client or init_firestore()
+
+# Singleton Firestore AsyncClient, created on first use so it binds to the running event loop
+_firestore_async_client = None
+
+def get_firestore_async_client():
+    """Returns a shared Firestore AsyncClient instance."""
+    global _firestore_async_client
+    if _firestore_async_client is None:
+        init_firestore()
+        from firebase_admin import firestore_async
+        _firestore_async_client = firestore_async.client()
+        logger.info("✅ Firestore async client initialized.")
+    return _firestore_async_client
+
+@firebase_call
+async def ping_firestore_async():
+    """Readiness probe: one small document read."""
+    await get_firestore_async_client().collection("stats").document("user_counts").get()
 
 # ---------------- FIREBASE AUTH ----------------
 
-def get_firebase_user(email: str):
-    """Retrieve a Firebase user by email."""
-    try:
-        return auth.get_user_by_email(email)
-    except firebase_admin.auth.UserNotFoundError:
-        return None
-        
-def get_firebase_user_by_uid(uid: str):
-    """Retrieve a Firebase user by UID."""
+@functools.cache
+def _auth_call(method: str):
+    """firebase_admin.auth.<method>, recorded as `auth.<method>`; resolved per call so patched functions apply."""
+    def call(*args, **kwargs):
+        return getattr(get_firebase_auth(), method)(*args, **kwargs)
+    return instrument(FIREBASE_CALL_SECONDS, FIREBASE_CALL_ERRORS, f"auth.{method}", span="auth")(call)
+
+def call_auth(method: str, *args, **kwargs):
+    """Calls a firebase_admin.auth function with metrics; blocking, like the Auth REST client."""
+    return _auth_call(method)(*args, **kwargs)
+
+async def call_auth_async(method: str, *args, **kwargs):
+    """Calls a firebase_admin.auth function with metrics in the threadpool."""
+    return await run_in_threadpool(_auth_call(method), *args, **kwargs)
+
+def _fetch_firebase_user(method: str, key: str):
+    generation = auth_user_cache.generation()
     try:
-        return auth.get_user(uid)
-    except firebase_admin.auth.UserNotFoundError:
+        user = call_auth(method, key)
+    except get_firebase_auth().UserNotFoundError:
         return None
-        
-def create_firebase_user(email: str, password: str):
-    """Creates a new Firebase user."""
-    user = auth.create_user(email=email, password=password)
-    logger.info(f"✅ Firebase user created: {email}")
+    auth_user_cache.put(user, generation)
     return user
 
-def delete_firebase_user(user_id: str):
-    """Deletes a Firebase user."""
-    auth.delete_user(user_id)
-    logger.info(f"🗑️ Firebase user deleted: {user_id}")
+@firebase_call(span=None)
+async def get_firebase_user_async(email: str):
+    """Retrieve a Firebase user by email without blocking the event loop."""
+    return auth_user_cache.get_by_email(email) or await run_in_threadpool(_fetch_firebase_user, "get_user_by_email", email)
+
+@firebase_call(span=None)
+async def get_firebase_user_by_uid_async(uid: str):
+    """Retrieve a Firebase user by UID without blocking the event loop."""
+    return auth_user_cache.get_by_uid(uid) or await run_in_threadpool(_fetch_firebase_user, "get_user", uid)
+
+# Firebase Auth accepts at most 100 identifiers per get_users call
+AUTH_GET_USERS_CHUNK = 100
+
+# Firebase Auth deletes at most 1000 accounts per delete_users call
+AUTH_DELETE_USERS_CHUNK = 1000
+
+@firebase_call(span=None)
+async def delete_firebase_users_async(uids: list) -> dict:
+    """Deletes Firebase users 1000 per request; returns {uid: reason} for the ones that failed."""
+    chunks = [uids[i:i + AUTH_DELETE_USERS_CHUNK] for i in range(0, len(uids), AUTH_DELETE_USERS_CHUNK)]
+    results = await asyncio.gather(*(call_auth_async("delete_users", chunk) for chunk in chunks))
+    auth_user_cache.invalidate(*uids)
+    failures = {}
+    for chunk, result in zip(chunks, results):
+        failures.update({chunk[error.index]: error.reason for error in result.errors})
+    logger.info(f"🗑️ Firebase users deleted: {len(uids) - len(failures)}")
+    return failures
+
+@firebase_call(span=None)
+async def get_firebase_users_async(identifiers: list) -> list:
+    """Retrieve Firebase users for UidIdentifier/EmailIdentifier lists, 100 per request, chunks in parallel."""
+    chunks = [identifiers[i:i + AUTH_GET_USERS_CHUNK] for i in range(0, len(identifiers), AUTH_GET_USERS_CHUNK)]
+    generation = auth_user_cache.generation()
+    results = await asyncio.gather(*(call_auth_async("get_users", chunk) for chunk in chunks))
+    users = [user for result in results for user in result.users]
+    for user in users:
+        auth_user_cache.put(user, generation)
+    return users
 
 # ---------------- FIRESTORE USERS ----------------
 
-def get_user_from_firestore(user_id: str):
+@firebase_call
+async def get_user_snapshot_from_firestore_async(user_id: str):
+    """Retrieve a user's Firestore snapshot, for callers that also need its update_time."""
+    return await get_firestore_async_client().collection("users").document(user_id).get()
+
+@firebase_call
+async def get_user_from_firestore_async(user_id: str):
     """Retrieve user document from Firestore."""
-    user_doc = _firestore_client.collection("users").document(user_id).get()
+    user_doc = await get_user_snapshot_from_firestore_async(user_id)
     return user_doc.to_dict() if user_doc.exists else None
 
-def create_user_in_firestore(user_id: str, update_data: dict):
-    """Updates a Firestore user document."""
-    _firestore_client.collection("users").document(user_id).set(update_data)
+@firebase_call
+async def get_users_from_firestore_by_ids_async(user_ids: list) -> dict:
+    """Retrieve many user documents in one batched read; returns {uid: data} for those that exist."""
+    db = get_firestore_async_client()
+    refs = [db.collection("users").document(user_id) for user_id in user_ids]
+    return {user_doc.id: user_doc.to_dict() async for user_doc in db.get_all(refs) if user_doc.exists}
+
+@firebase_call
+async def find_users_in_firestore_async(status: str = None, practice_name: str = None, fields: list = None, limit: int = None) -> dict:
+    """Retrieve {uid: data} for users matching the given status and practice name, at most `limit` of them."""
+    query = get_firestore_async_client().collection("users")
+    if fields:
+        query = query.select(fields)
+    if status:
+        query = query.where("status", "==", status)
+    if practice_name:
+        query = query.where("practice_name", "==", practice_name)
+    if limit:
+        query = query.limit(limit)
+    return {user_doc.id: user_doc.to_dict() async for user_doc in query.stream()}
+
+@firebase_call
+async def find_user_in_firestore_by_email_async(email: str):
+    """Retrieve a user document by its `email` field with a single query."""
+    query = get_firestore_async_client().collection("users").where("email", "==", email).limit(1)
+    async for user_doc in query.stream():
+        return user_doc.to_dict()
+    return None
+
+@firebase_call
+async def create_user_in_firestore_async(user_id: str, update_data: dict):
+    """Creates or overwrites a Firestore user document."""
+    await get_firestore_async_client().collection("users").document(user_id).set(update_data)
     logger.info(f"🔄 Updated Firestore user: {user_id}")
 
-def update_user_in_firestore(user_id: str, update_data: dict):
+@firebase_call
+async def update_user_in_firestore_async(user_id: str, update_data: dict):
     """Updates a Firestore user document."""
-    _firestore_client.collection("users").document(user_id).update(update_data)
+    await get_firestore_async_client().collection("users").document(user_id).update(update_data)
     logger.info(f"🔄 Updated Firestore user: {user_id}")
 
-def delete_user_from_firestore(user_id: str):
+@firebase_call
+async def delete_user_from_firestore_async(user_id: str):
     """Deletes a user document from Firestore."""
-    _firestore_client.collection("users").document(user_id).delete()
+    await get_firestore_async_client().collection("users").document(user_id).delete()
     logger.info(f"🗑️ Firestore user deleted: {user_id}")
 
+# Firestore commits at most 500 writes per batch
+FIRESTORE_BATCH_LIMIT = 500
+
+@firebase_call
+async def write_users_batched_async(writes: list) -> set:
+    """
+    Commits ("set" | "update" | "delete", user_id, data) writes to the users collection in batches of 500,
+    committed concurrently. Returns the ids whose batch failed.
+    """
+    db = get_firestore_async_client()
+    failed_ids = set()
+
+    async def commit(chunk):
+        batch = db.batch()
+        for op, user_id, data in chunk:
+            user_ref = db.collection("users").document(user_id)
+            if op == "set":
+                batch.set(user_ref, data)
+            elif op == "update":
+                batch.update(user_ref, data)
+            else:
+                batch.delete(user_ref)
+        try:
+            await batch.commit()
+        except Exception:
+            logger.exception(f"❌ Firestore batch of {len(chunk)} writes failed")
+            failed_ids.update(user_id for _, user_id, _ in chunk)
+
+    await asyncio.gather(*(
+        commit(writes[i:i + FIRESTORE_BATCH_LIMIT]) for i in range(0, len(writes), FIRESTORE_BATCH_LIMIT)
+    ))
+    logger.info(f"🔄 Committed {len(writes) - len(failed_ids)} batched Firestore user writes")
+    return failed_ids
+
+# ---------------- USER COUNTERS ----------------
+
+# Statuses with a maintained total; "total" counts every user document
+COUNTED_STATUSES = ("active", "on_hold")
+
+def _user_counts_doc():
+    return get_firestore_async_client().collection("stats").document("user_counts")
+
+@firebase_call(span="count")
+async def get_user_counts_async():
+    """Returns the maintained per-status user totals, or None while the counters are cold."""
+    counts_doc = await _user_counts_doc().get()
+    return counts_doc.to_dict() if counts_doc.exists else None
+
+@firebase_call(span="count")
+async def adjust_user_counts_async(deltas: dict):
+    """Applies increments such as {"total": 1, "active": 1}; a no-op until the counters are seeded."""
+    deltas = {key: delta for key, delta in deltas.items() if delta and key in ("total", *COUNTED_STATUSES)}
+    if not deltas:
+        return
+    from firebase_admin import firestore
+    from google.api_core.exceptions import NotFound
+    try:
+        await _user_counts_doc().update({key: firestore.Increment(delta) for key, delta in deltas.items()})
+    except NotFound:
+        logger.debug("User counters are cold; skipping increment.")
+
+@firebase_call(span="count")
+async def count_users_async(status: str = None) -> int:
+    """Counts user documents with a Firestore aggregation query."""
+    count_query = get_firestore_async_client().collection("users")
+    if status:
+        count_query = count_query.where("status", "==", status)
+    return (await count_query.count().get())[0][0].value
+
+@firebase_call(span="count")
+async def reconcile_user_counts_async() -> dict:
+    """Recomputes the per-status totals with aggregation queries and overwrites the counters document."""
+    statuses = (None, *COUNTED_STATUSES)
+    totals = await asyncio.gather(*(count_users_async(status) for status in statuses))
+    counts = {status or "total": total for status, total in zip(statuses, totals)}
+    from firebase_admin import firestore
+    await _user_counts_doc().set({**counts, "reconciled_at": firestore.SERVER_TIMESTAMP})
+    logger.info(f"🧮 Reconciled user counters: {counts}")
+    return counts
+
 # ---------------- PAGINATED LIST USERS ----------------
-def get_users_from_firestore(limit: int = 10, last_uid: str = None, status: str = None):
-    """Retrieve a paginated list of users from Firestore with optional status filtering and total count."""
-    db = get_firestore_client()
-    users = []
-    last_doc_id = None  # Track last document for pagination
+@firebase_call(span="count")
+async def get_total_users_async(status: str = None) -> int:
+    """Reads a total from the maintained counters, aggregating only while they are cold."""
+    counts = await get_user_counts_async()
+    total_users = counts.get(status or "total") if counts else None
+    if total_users is None:
+        total_users = await count_users_async(status)
+    return total_users
 
-    users_ref = db.collection("users").order_by("uid").limit(limit)
+# Documents per query when streaming the whole collection; bounds each RPC, not the export size
+EXPORT_PAGE_SIZE = 500
 
+@firebase_call
+async def stream_users_from_firestore_async(status: str = None, page_size: int = EXPORT_PAGE_SIZE):
+    """Yield projected user documents ordered by uid, one bounded query per page, as they arrive."""
+    users_ref = get_firestore_async_client().collection("users").select(USER_LIST_FIELDS)
     if status:
-        users_ref = db.collection("users").where("status", "==", status).order_by("uid").limit(limit)
-
-    if last_uid:
-        last_doc = db.collection("users").document(last_uid).get()
-        if last_doc.exists:
-            users_ref = users_ref.start_after(last_doc)
-
-    users_stream = users_ref.stream()
-
-    for user_doc in users_stream:
-        user_data = user_doc.to_dict()
-        users.append({
-            "uid": user_data.get("uid", "Unknown"),
-            "email": user_data.get("email", "Unknown"),
-            "first_name": user_data.get("first_name", "Unknown"),
-            "last_name": user_data.get("last_name", "Unknown"),
-            "practice_name": user_data.get("practice_name", "Unknown"),
-            "npi": user_data.get("npi", "Unknown"),
-            "status": user_data.get("status", "active")
-        })
-        last_doc_id = user_data.get("uid")  # Store last user's UID for next page
-
-    # 🔥 Efficient total count using Firestore aggregation query
-    count_query = db.collection("users")
+        users_ref = users_ref.where("status", "==", status)
+    users_ref = users_ref.order_by("uid")
+
+    last_uid = None
+    while True:
+        page_ref = users_ref.start_after({"uid": last_uid}) if last_uid else users_ref
+        count = 0
+        async for user_doc in page_ref.limit(page_size).stream():
+            user = user_doc.to_dict()
+            last_uid = user["uid"]
+            count += 1
+            yield user
+        if count < page_size:
+            return
+
+@firebase_call(span=None)
+async def get_users_from_firestore_async(limit: int = 10, last_uid: str = None, status: str = None, before_uid: str = None):
+    """
+    Retrieve a paginated list of users from Firestore with optional status filtering and total count.
+    `last_uid` pages forward from that uid and `before_uid` pages backward from it; the page and the
+    total are fetched concurrently.
+    """
+    db = get_firestore_async_client()
+    last_doc_id = None  # Track last document for pagination
+
+    users_ref = db.collection("users").select(USER_LIST_FIELDS)
     if status:
-        count_query = count_query.where("status", "==", status)
+        users_ref = users_ref.where("status", "==", status)
+
+    # Cursor by field value so paging never needs the previous page's snapshot
+    if before_uid:
+        from firebase_admin import firestore
+        users_ref = users_ref.order_by("uid", direction=firestore.Query.DESCENDING).start_after({"uid": before_uid})
+    else:
+        users_ref = users_ref.order_by("uid")
+        if last_uid:
+            users_ref = users_ref.start_after({"uid": last_uid})
+
+    # One extra row tells us whether there is another page in this direction
+    users_ref = users_ref.limit(limit + 1)
+
+    async def fetch_page():
+        with request_span("firestore"):
+            return [UserListRow.from_dict(user_doc.to_dict()) async for user_doc in users_ref.stream()]
+
+    users, total_users = await asyncio.gather(fetch_page(), get_total_users_async(status))
 
-    total_users = count_query.count().get()[0][0].value  # Fast aggregation query for counting
+    has_more = len(users) > limit
+    users = users[:limit]
+    if before_uid:
+        users.reverse()
+    if users:
+        last_doc_id = users[-1].uid  # Store last user's UID for next page
 
     logger.info(f"📜 Retrieved {len(users)} users from Firestore with status={status or 'any'} (Total: {total_users}).")
 
     return {
         "users": users,
         "next_page_uid": last_doc_id,
-        "total_count": total_users
+        "total_count": total_users,
+        "has_more": has_more,
     }
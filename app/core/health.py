@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import ping_db_async
+from app.core.firebase import ping_firestore_async
+from app.core.startup import startup
+
+
+class DependencyProbe:
+    """
+    Runs a readiness check at most once per `ttl_seconds`; concurrent callers share the
+    check in flight, so frequent /readyz polling costs at most one backend call per TTL.
+    """
+
+    def __init__(self, name: str, check, ttl_seconds: float, timeout_seconds: float):
+        self.name = name
+        self.check = check
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._pending: Optional[asyncio.Future] = None
+
+    async def _run(self) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.check(), self.timeout_seconds)
+            result = {"ok": True, "error": None}
+        except Exception as e:
+            result = {"ok": False, "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._result, self._checked_at = result, time.monotonic()
+        return result
+
+    async def status(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl_seconds:
+            return self._result
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(self._run())
+        return await asyncio.shield(self._pending)
+
+
+readiness_probes = [
+    DependencyProbe(name, check, settings.HEALTH_PROBE_TTL_SECONDS, settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+    for name, check in (("postgres", ping_db_async), ("firestore", ping_firestore_async))
+]
+
+
+async def check_readiness() -> tuple[bool, dict]:
+    """Ready once startup has completed and every probe passes."""
+    if not startup.complete:
+        return False, {"status": "starting", "checks": {}, "startup": startup.stats()}
+    results = await asyncio.gather(*(probe.status() for probe in readiness_probes))
+    checks = {probe.name: result for probe, result in zip(readiness_probes, results)}
+    ready = all(result["ok"] for result in results)
+    return ready, {"status": "ready" if ready else "unavailable", "checks": checks, "startup": startup.stats()}
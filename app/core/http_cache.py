@@ -0,0 +1,35 @@
+import hashlib
+
+from fastapi import Request, Response
+
+# Dashboard responses are per-admin and must be revalidated on every use
+CACHE_CONTROL = "private, no-cache"
+
+_CACHE_HEADERS = {"Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+
+def weak_etag(*parts) -> str:
+    """Weak validator over the given parts; weak because compression may change the bytes sent."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers.update(_CACHE_HEADERS)
+
+
+def not_modified(etag: str) -> Response:
+    """304 carrying the validator and cache policy, with no body to encode."""
+    return Response(status_code=304, headers={"ETag": etag, **_CACHE_HEADERS})
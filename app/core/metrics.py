@@ -0,0 +1,156 @@
+import functools
+import inspect
+import time
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.timing import request_span
+
+# Per-process metrics exposed at /metrics. Every label takes values from a fixed set
+# (route templates, function names, Resend endpoints), never ids or emails.
+
+# Seconds, from cache hits up to bulk operations
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP responses by route template and status code", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time until the response body finished sending", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+FIREBASE_CALL_SECONDS = Histogram(
+    "firebase_call_duration_seconds", "Latency of app/core/firebase.py wrappers and Firebase Auth RPCs", ["function"],
+    buckets=LATENCY_BUCKETS,
+)
+FIREBASE_CALL_ERRORS = Counter(
+    "firebase_call_errors_total", "Firebase wrapper calls and Auth RPCs that raised", ["function"]
+)
+
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the SQLAlchemy pool", ["engine"])
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool, including opening new ones", ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+
+EMAIL_SEND_SECONDS = Histogram(
+    "email_send_duration_seconds", "Resend requests including retries", ["endpoint"], buckets=LATENCY_BUCKETS
+)
+EMAIL_SEND_FAILURES = Counter("email_send_failures_total", "Resend requests that failed after retries", ["endpoint"])
+EMAIL_SEND_RETRIES = Counter("email_send_retries_total", "Resend attempts retried", ["endpoint"])
+
+
+def instrument(histogram: Histogram, errors: Counter, label: str, span: Optional[str] = None):
+    """
+    Decorator recording call latency and raised exceptions; handles sync, async and async generator
+    functions. Calls also count towards the request's `span` timing, except for async generators,
+    which mostly run after the response has started.
+    """
+    observed = histogram.labels(label)
+    failed = errors.labels(label)
+
+    def decorator(fn):
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                except Exception:
+                    failed.inc()
+                    raise
+                finally:
+                    observed.observe(time.perf_counter() - started)
+        elif inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with request_span(span):
+                        return await fn(*args, **kwargs)
+                except Exception:
+                    failed.inc()
+                    raise
+                finally:
+                    observed.observe(time.perf_counter() - started)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with request_span(span):
+                        return fn(*args, **kwargs)
+                except Exception:
+                    failed.inc()
+                    raise
+                finally:
+                    observed.observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+
+def firebase_call(fn=None, *, span: Optional[str] = "firestore"):
+    """
+    Instruments a Firebase wrapper under its function name, timed as the request's `span`.
+    Auth wrappers pass `span=None`, as their RPCs are timed as `auth` where they are made; so do
+    wrappers that time their parts under different spans.
+    """
+    if fn is None:
+        return functools.partial(firebase_call, span=span)
+    return instrument(FIREBASE_CALL_SECONDS, FIREBASE_CALL_ERRORS, fn.__name__, span)(fn)
+
+
+# ---------------- SQLALCHEMY POOL ----------------
+
+class _PoolCollector:
+    """Reads pool occupancy at scrape time, so nothing is tracked per checkout for it."""
+
+    def __init__(self):
+        self.engines = {}
+
+    def collect(self):
+        in_use = GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", labels=["engine"])
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if hasattr(pool, "checkedout"):
+                in_use.add_metric([name], pool.checkedout())
+                size.add_metric([name], pool.size())
+                overflow.add_metric([name], max(pool.overflow(), 0))
+        return [in_use, size, overflow]
+
+
+_pool_collector = _PoolCollector()
+REGISTRY.register(_pool_collector)
+
+
+def instrument_pool(engine, name: str):
+    """
+    Times connection checkout on a sync Engine (for an AsyncEngine, pass its sync_engine).
+    SQLAlchemy has no event before a checkout starts, so the pool's `_do_get` is wrapped
+    through a subclass; `recreate()` on dispose keeps the subclass.
+    """
+    pool = engine.pool
+    checkouts = DB_POOL_CHECKOUTS.labels(name)
+    waited = DB_POOL_WAIT_SECONDS.labels(name)
+    base = type(pool)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        connection = base._do_get(self)
+        waited.observe(time.perf_counter() - started)
+        checkouts.inc()
+        return connection
+
+    pool.__class__ = type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+    _pool_collector.engines[name] = engine
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,26 +1,74 @@
-from fastapi import FastAPI, Request, HTTPException, Depends
+import time
+from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.security import verify_access_token
-from app.core.database import get_db_context
-from app.models.user import User
-from app.core.config import EXCLUDED_ROUTES, logger
+from app.core.database import get_async_db_context, get_db_context
+from app.core.session_cache import AdminSnapshot, session_cache
+from app.models.user import User, UserRole
+from app.core.config import EXCLUDED_ROUTES, logger, settings
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+from app.core.profiling import PROFILE_MODES, finish_profile, start_profile
+from app.core.timing import request_span, track_request
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+def check_session(admin: User | None, token: str, token_exp: float | None, generation: tuple[int, int]) -> AdminSnapshot | JSONResponse:
+    """
+    Checks a loaded admin against the presented token and caches the session if valid and not
+    invalidated since `generation` was captured.
+    """
+    if not admin:
+        return JSONResponse(status_code=404, content={"detail": "Admin not found"})
+
+    # Verify if the token matches the one stored in the database
+    if admin.session_token != token:
+        return JSONResponse(status_code=401, content={"detail": "Session expired or invalid"})
+
+    return session_cache.put(token, admin, generation, token_exp)
+
+def lookup_session(email: str, token: str, token_exp: float | None, generation: tuple[int, int]) -> AdminSnapshot | JSONResponse:
+    """Validates a session against the database. Blocking, so callers run it in the threadpool."""
+    with get_db_context() as db:
+        admin = db.query(User).filter(User.email == email).first()
+        return check_session(admin, token, token_exp, generation)
+
+async def lookup_session_async(email: str, token: str, token_exp: float | None, generation: tuple[int, int]) -> AdminSnapshot | JSONResponse:
+    """Validates a session against the database on the async engine."""
+    async with get_async_db_context() as db:
+        result = await db.execute(select(User).where(User.email == email))
+        return check_session(result.scalars().first(), token, token_exp, generation)
+
+class AuthMiddleware:
+    """Pure ASGI authentication middleware; database lookups never run on the event loop."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.exclude_routes = EXCLUDED_ROUTES
 
-    async def dispatch(self, request: Request, call_next):
-        if request.method == "OPTIONS":
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] in self.exclude_routes:
+            await self.app(scope, receive, send)  # Skip authentication for excluded routes
+            return
 
-        if request.url.path in self.exclude_routes:
-            return await call_next(request)  # Skip authentication for excluded routes
+        request = Request(scope)
+        result = await self.authenticate(request)
+        if isinstance(result, JSONResponse):
+            await result(scope, receive, send)
+            return
 
+        request.state.user = result  # Store admin in request state
+        await self.app(scope, receive, send)
+
+    async def authenticate(self, request: Request) -> AdminSnapshot | JSONResponse:
         auth_header = request.headers.get("Authorization")
-        
+
         if not auth_header or not auth_header.startswith("Bearer "):
             return JSONResponse(status_code=401, content={"detail": "Missing or invalid token"})
 
@@ -29,19 +77,142 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if not payload:
             return JSONResponse(status_code=401, content={"detail": "Invalid or expired token"})
 
+        cached_admin = session_cache.get(token)
+        if cached_admin:
+            return cached_admin
+
         email = payload.get("sub")
-        
-        with get_db_context() as db:
-            admin = db.query(User).filter(User.email == email).first()
+        # Captured before the read, so a logout landing during the lookup keeps its session out of the cache
+        generation = session_cache.generation(email)
+        with request_span("session"):
+            if settings.DB_ASYNC:
+                return await lookup_session_async(email, token, payload.get("exp"), generation)
+            return await run_in_threadpool(lookup_session, email, token, payload.get("exp"), generation)
+
+# Label for requests that match no route, so scanners probing random paths add one series, not many
+UNMATCHED_ROUTE = "unmatched"
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. /api/v1/users/{user_id}, for bounded metric labels."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Rejected before routing (e.g. by AuthMiddleware): resolve the template the same way the router would
+    for candidate in scope["app"].router.routes:
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return candidate.path
+    return UNMATCHED_ROUTE
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts by status and latency per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "other"
+            route = route_template(scope)
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+def _is_superadmin(scope: Scope) -> bool:
+    """True once AuthMiddleware has authenticated a superadmin for this request."""
+    admin = scope.get("state", {}).get("user")
+    return admin is not None and admin.role == UserRole.SUPERADMIN
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware collecting the request's backend spans, reported in a warning for requests
+    slower than SLOW_REQUEST_SECONDS and, with SERVER_TIMING_ENABLED, in a Server-Timing header.
+    The header goes to authenticated superadmins only: on login and other unauthenticated responses
+    the spans (e.g. whether bcrypt ran) would tell anyone which admin emails exist.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        with track_request() as timings:
+            async def send_wrapper(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if settings.SERVER_TIMING_ENABLED and _is_superadmin(scope):
+                        MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = timings.elapsed()
+                if elapsed >= settings.SLOW_REQUEST_SECONDS:
+                    logger.warning(
+                        f"🐢 Slow request {scope['method']} {route_template(scope)} -> {status} "
+                        f"in {elapsed:.2f}s ({timings.summary()})"
+                    )
+
+class ProfilingMiddleware:
+    """
+    Profiles one request for a superadmin sending `X-Profile: cprofile` or `X-Profile: sample`.
+    The profile replaces the response body as a download, and the route's own status is sent
+    in X-Profiled-Status. Runs inside AuthMiddleware, so the admin is known by then.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-            if not admin:
-                return JSONResponse(status_code=404, content={"detail": "Admin not found"})
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        mode = Headers(scope=scope).get("x-profile") if scope["type"] == "http" else None
+        if not mode:
+            await self.app(scope, receive, send)
+            return
 
-            # Verify if the token matches the one stored in the database
-            if admin.session_token != token:
-                return JSONResponse(status_code=401, content={"detail": "Session expired or invalid"})
+        admin = scope.get("state", {}).get("user")
+        if admin is None or admin.role != UserRole.SUPERADMIN:
+            response = JSONResponse(status_code=403, content={"detail": "Access denied. Superadmin privileges required."})
+        elif mode not in PROFILE_MODES:
+            response = JSONResponse(status_code=400, content={"detail": f"X-Profile must be one of: {', '.join(PROFILE_MODES)}"})
+        elif (recorder := start_profile(mode, settings.PROFILE_SAMPLE_INTERVAL_SECONDS)) is None:
+            response = JSONResponse(status_code=409, content={"detail": "Another request is being profiled"})
+        else:
+            status = 500
 
-            request.state.user = admin  # Store admin in request state
+            async def discard(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
 
-        response = await call_next(request)
-        return response
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profile = finish_profile(recorder)
+            filename = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.{recorder.extension}"
+            response = Response(profile, media_type=recorder.media_type, headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "X-Profiled-Status": str(status),
+            })
+            logger.info(f"🔬 Profiled {scope['method']} {route_template(scope)} for {admin.email} ({mode})")
+        await response(scope, receive, send)
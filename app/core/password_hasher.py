@@ -0,0 +1,97 @@
+import asyncio
+import math
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.core.config import settings, pwd_context
+from app.core.timing import request_span
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool so login bursts cannot starve the
+    shared anyio threadpool; bcrypt releases the GIL, so the threads hash in parallel.
+    Work beyond `workers + queue_size` is rejected with 429 instead of queueing unbounded.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=1024)
+
+    def _timed(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self._latencies.append(elapsed)
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog should have drained, at the recent average cost."""
+        average = statistics.fmean(self._latencies) if self._latencies else 0.25
+        return max(1, math.ceil(self._in_flight / self.workers * average))
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many password requests, please retry shortly",
+                    headers={"Retry-After": str(self._retry_after())},
+                )
+            self._in_flight += 1
+        try:
+            with request_span("bcrypt"):
+                return await asyncio.wrap_future(self._executor.submit(self._timed, fn, *args))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verifies a password; the second item is a new hash when the stored one uses outdated settings."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies)
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_ms_p50": round(samples[len(samples) // 2] * 1000, 1) if samples else 0.0,
+                "latency_ms_p99": round(samples[int(len(samples) * 0.99)] * 1000, 1) if samples else 0.0,
+            }
+
+
+# Shared per-process bcrypt executor
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
@@ -0,0 +1,110 @@
+import cProfile
+import marshal
+import os
+import sys
+import threading
+from collections import Counter
+
+# Values of the X-Profile request header
+PROFILE_MODES = ("cprofile", "sample")
+
+# One profile at a time: cProfile hooks the whole event loop thread, so concurrent profiles would overlap
+_profiling = threading.Lock()
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CProfileRecorder:
+    """
+    Deterministic profile of the event loop thread, saved in the pstats format (snakeviz, `python -m pstats`).
+    Includes whatever else the loop ran meanwhile; threadpool work shows up only as the await.
+    """
+
+    media_type = "application/octet-stream"
+    extension = "prof"
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self) -> bytes:
+        self._profiler.disable()
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)
+
+
+class StackSampler:
+    """
+    Samples the event loop thread, and worker threads running app code, every `interval_seconds`.
+    Saved as folded stacks (`thread;outer;...;inner count`) for flamegraph.pl or speedscope.
+    """
+
+    media_type = "text/plain; charset=utf-8"
+    extension = "folded"
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.samples = Counter()
+        self._loop_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    @staticmethod
+    def _frames(frame) -> list:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _sample(self, own: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = self._frames(frame)
+            # Idle pool threads would otherwise outweigh everything the request did
+            if ident != self._loop_thread and not any(_APP_DIR in entry for entry in stack):
+                continue
+            self.samples[";".join([names.get(ident, str(ident)), *stack])] += 1
+
+    def _run(self):
+        # Samples on start and on stop too, so a request shorter than one interval still has a profile
+        own = threading.get_ident()
+        self._sample(own)
+        while not self._stop.wait(self.interval_seconds):
+            self._sample(own)
+        self._sample(own)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> bytes:
+        self._stop.set()
+        self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items()).encode()
+
+
+def start_profile(mode: str, interval_seconds: float):
+    """Starts a `cprofile` or `sample` recorder; None while another request is being profiled."""
+    if not _profiling.acquire(blocking=False):
+        return None
+    recorder = CProfileRecorder() if mode == "cprofile" else StackSampler(interval_seconds)
+    try:
+        recorder.start()
+    except Exception:
+        _profiling.release()
+        raise
+    return recorder
+
+
+def finish_profile(recorder) -> bytes:
+    try:
+        return recorder.stop()
+    finally:
+        _profiling.release()
+
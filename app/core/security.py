@@ -1,3 +1,4 @@
+import inspect
 import jwt
 from datetime import datetime, timedelta
 from app.core.config import settings, pwd_context
@@ -52,6 +53,26 @@ def verify_password_reset_token(token: str) -> str:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=400, detail="Invalid reset token")
 
+# Opaque pagination cursors; the audience keeps them from being accepted as access tokens
+PAGE_CURSOR_AUDIENCE = "users-page-cursor"
+
+def create_page_cursor(uid: str, status: str | None, direction: str) -> str:
+    """Encodes a signed, opaque cursor pointing before or after the given uid."""
+    payload = {"uid": uid, "status": status, "dir": direction, "aud": PAGE_CURSOR_AUDIENCE}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def verify_page_cursor(cursor: str) -> dict:
+    """
+    Decodes a pagination cursor into its uid, status filter and direction.
+    """
+    try:
+        payload = jwt.decode(cursor, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=PAGE_CURSOR_AUDIENCE)
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if payload.get("dir") not in ("next", "prev") or not payload.get("uid"):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return payload
+
 def require_superadmin(func):
     @wraps(func)
     async def wrapper(request: Request, *args, **kwargs):
@@ -63,6 +84,9 @@ def require_superadmin(func):
         if admin.role != UserRole.SUPERADMIN:  # Check if role is SUPERADMIN
             raise HTTPException(status_code=403, detail="Access denied. Superadmin privileges required.")
 
-        return func(request=request, *args, **kwargs)
+        result = func(request=request, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
 
     return wrapper
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings, logger
+from app.core.session_cache import SessionCache, session_cache
+
+# Postgres channel carrying logins, logouts and admin deletions between workers
+SESSION_CHANNEL = "admin_sessions"
+
+# Seconds between liveness probes on an idle listener connection
+HEALTHCHECK_SECONDS = 30
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+def _notify_params(email: str) -> dict:
+    return {"channel": SESSION_CHANNEL, "payload": json.dumps({"email": email, "pid": os.getpid()})}
+
+
+def publish_session_change(db: Session, email: str) -> None:
+    """Queues a NOTIFY in the caller's transaction; every worker drops the admin's cached sessions once it commits."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(_NOTIFY, _notify_params(email))
+
+
+async def publish_session_change_async(db: AsyncSession, email: str) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(_NOTIFY, _notify_params(email))
+
+
+def to_listen_dsn(database_url: str) -> str:
+    """Plain libpq DSN for asyncpg, which rejects SQLAlchemy driver names and channel binding."""
+    url = make_url(database_url)
+    query = dict(url.query)
+    query.pop("channel_binding", None)
+    return url.set(drivername="postgresql", query=query).render_as_string(hide_password=False)
+
+
+class SessionBus:
+    """
+    Keeps a LISTEN connection on SESSION_CHANNEL and evicts announced admins from a session cache.
+    The cache is cleared whenever the listener connects or drops, since notifications may have been missed.
+    """
+
+    def __init__(self, database_url: str, cache: SessionCache):
+        self.enabled = settings.SESSION_BUS_ENABLED and make_url(database_url).get_backend_name() == "postgresql"
+        self.cache = cache
+        self._dsn = to_listen_dsn(database_url) if self.enabled else None
+        self.received = 0
+        self.reconnects = 0
+
+    def _on_notification(self, _connection, _pid, _channel, payload: str):
+        self.received += 1
+        try:
+            email = json.loads(payload)["email"]
+        except (ValueError, KeyError):
+            logger.warning(f"⚠️ Ignoring malformed session notification: {payload!r}")
+            return
+        self.cache.invalidate_email(email)
+
+    def _set_live(self, live: bool):
+        self.cache.clear()
+        self.cache.revocations_live = live
+
+    async def _listen(self):
+        connection = await asyncpg.connect(self._dsn)
+        try:
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: closed.set())
+            await connection.add_listener(SESSION_CHANNEL, self._on_notification)
+            self._set_live(True)
+            logger.info("📡 Listening for session changes from other workers")
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=HEALTHCHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    await connection.execute("SELECT 1")  # Surfaces half-open connections
+        finally:
+            self._set_live(False)
+            connection.terminate()
+
+    async def run(self):
+        """Listens until cancelled, reconnecting with exponential backoff."""
+        backoff = 1
+        while True:
+            try:
+                await self._listen()
+                backoff = 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Session listener disconnected, retrying in {backoff}s: {e}")
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "listening": self.cache.revocations_live,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+
+# Per-process listener feeding the shared session cache
+session_bus = SessionBus(settings.DATABASE_URL, session_cache)
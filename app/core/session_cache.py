@@ -0,0 +1,128 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+from cachetools import TLRUCache
+
+from app.core.config import settings
+from app.models.user import UserRole
+
+
+@dataclass(frozen=True)
+class AdminSnapshot:
+    """Detached, read-only copy of an authenticated admin."""
+    id: int
+    email: str
+    role: UserRole
+
+    @classmethod
+    def from_user(cls, user) -> "AdminSnapshot":
+        return cls(id=user.id, email=user.email, role=user.role)
+
+
+@dataclass(frozen=True)
+class _CachedSession:
+    admin: AdminSnapshot
+    expires_at: float
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionCache:
+    """
+    Bounded TTL/LRU cache of validated sessions, keyed by a hash of the token. While
+    `revocations_live` is set, revocations from other workers are delivered by the session
+    bus, so entries are kept for `live_ttl_seconds` instead.
+
+    Each admin has a generation that every invalidation bumps. A lookup captures it before
+    reading the database, and `put` drops the result if it changed meanwhile, so a read that
+    raced a logout or password change cannot cache the revoked session.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int, live_ttl_seconds: int | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.live_ttl_seconds = live_ttl_seconds or ttl_seconds
+        self.revocations_live = False
+        self._cache = TLRUCache(maxsize=maxsize, ttu=lambda _key, value, _now: value.expires_at, timer=time.time)
+        self._keys_by_email: dict[str, str] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0  # bumped by clear(), which invalidates every admin at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> AdminSnapshot | None:
+        """Returns the cached admin for a token, or None if it has to be validated against the database."""
+        key = _hash_token(token)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.admin
+
+    def generation(self, email: str) -> tuple[int, int]:
+        """Current generation of an admin's sessions; capture it before reading the database."""
+        with self._lock:
+            return self._epoch, self._generations.get(email, 0)
+
+    def put(self, token: str, user, generation: tuple[int, int], token_exp: float | None = None) -> AdminSnapshot:
+        """
+        Caches a validated session until the JWT expires or the cache TTL passes, whichever is first.
+        Skipped if the admin was invalidated since `generation` was captured; the admin is returned either way.
+        """
+        admin = AdminSnapshot.from_user(user)
+        expires_at = time.time() + (self.live_ttl_seconds if self.revocations_live else self.ttl_seconds)
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        key = _hash_token(token)
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(admin.email, 0)):
+                return admin
+            previous_key = self._keys_by_email.get(admin.email)
+            if previous_key and previous_key != key:
+                self._cache.pop(previous_key, None)
+            self._cache[key] = _CachedSession(admin=admin, expires_at=expires_at)
+            self._keys_by_email[admin.email] = key
+        return admin
+
+    def invalidate_email(self, email: str) -> None:
+        """Drops any cached session belonging to the given admin."""
+        with self._lock:
+            self._generations[email] = self._generations.get(email, 0) + 1
+            key = self._keys_by_email.pop(email, None)
+            if key:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._generations.clear()
+            self._cache.clear()
+            self._keys_by_email.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._cache.expire()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "revocations_live": self.revocations_live,
+            }
+
+
+# Shared per-process session cache
+session_cache = SessionCache(
+    maxsize=settings.SESSION_CACHE_MAXSIZE,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+    live_ttl_seconds=settings.SESSION_CACHE_LIVE_TTL_SECONDS,
+)
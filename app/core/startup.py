@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app import STARTED_AT
+from app.core.config import logger
+from app.core.database import init_db
+from app.core.firebase import init_firebase, init_firestore
+
+
+class Startup:
+    """
+    Initializes backends concurrently in worker threads, retrying each until it succeeds,
+    so an unreachable backend delays readiness instead of crashing the process.
+    """
+
+    def __init__(self, steps: dict):
+        self.steps = steps
+        self._done: dict[str, asyncio.Event] = {}
+        self.seconds: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.import_seconds: Optional[float] = None
+        self.ready_seconds: Optional[float] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.ready_seconds is not None
+
+    def mark_imported(self):
+        """Called once the app module has finished importing."""
+        self.import_seconds = round(time.perf_counter() - STARTED_AT, 3)
+
+    def start(self) -> asyncio.Task:
+        """Lifespan: starts every step; returns the task to cancel on shutdown."""
+        self._done = {name: asyncio.Event() for name in self.steps}
+        return asyncio.create_task(self.run())
+
+    async def _run_step(self, name: str, init):
+        started = time.perf_counter()
+        backoff = 1
+        while True:
+            try:
+                await run_in_threadpool(init)
+                break
+            except Exception as e:
+                self.errors[name] = str(e)
+                logger.warning(f"⚠️ {name} initialization failed, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+        self.seconds[name] = round(time.perf_counter() - started, 3)
+        self.errors.pop(name, None)
+        self._done[name].set()
+
+    async def run(self):
+        await asyncio.gather(*(self._run_step(name, init) for name, init in self.steps.items()))
+        self.ready_seconds = round(time.perf_counter() - STARTED_AT, 3)
+        steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.seconds.items())
+        logger.info(f"🚀 Ready {self.ready_seconds:.2f}s after start (import {self.import_seconds or 0:.2f}s; {steps})")
+
+    async def after(self, name: str, fn, *args):
+        """Runs `fn(*args)` once step `name` has succeeded; for background tasks needing that backend."""
+        await self._done[name].wait()
+        return await fn(*args)
+
+    def stats(self) -> dict:
+        return {
+            "complete": self.complete,
+            "import_seconds": self.import_seconds,
+            "ready_seconds": self.ready_seconds,
+            "steps": {
+                name: {
+                    "ready": name in self.seconds,
+                    "seconds": self.seconds.get(name),
+                    "error": self.errors.get(name),
+                }
+                for name in self.steps
+            },
+        }
+
+
+# Firestore initialization includes the Firebase app, so it finishes after it
+startup = Startup({
+    "postgres": init_db,
+    "firebase": init_firebase,
+    "firestore": init_firestore,
+})
@@ -0,0 +1,72 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestTimings:
+    """
+    Time one request spent per backend (auth, firestore, count, session, db, resend, bcrypt).
+    Spans come from threadpool workers and gathered tasks too, so they are summed per name
+    and may add up to more than the request's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: dict[str, list] = {}  # name -> [seconds, calls]
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            entry = self.spans.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; `total` is the time until the response started."""
+        with self._lock:
+            spans = [f'{name};dur={seconds * 1000:.1f};desc="{calls}x"' for name, (seconds, calls) in self.spans.items()]
+        return ", ".join([*spans, f"total;dur={self.elapsed() * 1000:.1f}"])
+
+    def summary(self) -> str:
+        with self._lock:
+            return ", ".join(f"{name} {seconds:.2f}s/{calls}" for name, (seconds, calls) in self.spans.items()) or "no backend calls"
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_open_span: ContextVar[Optional[str]] = ContextVar("open_span", default=None)
+
+
+@contextmanager
+def track_request():
+    """Collects spans for the current request; workers and tasks it starts inherit the collector."""
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextmanager
+def request_span(name: Optional[str]):
+    """
+    Adds the block's duration to the current request's `name` span. A no-op outside a request
+    (background tasks), for `name=None`, and inside an open span of the same name, so nested
+    wrappers count once.
+    """
+    timings = _request_timings.get()
+    if timings is None or name is None or _open_span.get() == name:
+        yield
+        return
+    token = _open_span.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+        _open_span.reset(token)
@@ -1,16 +1,49 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response
-from app.api import admin, auth, users
-from app.core.database import init_db
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from app.api import admin, auth, health, users
+from app.core.database import dispose_engines
 from app.core.config import settings
-from app.core.middleware import AuthMiddleware
+from app.core.middleware import AuthMiddleware, MetricsMiddleware, ProfilingMiddleware, RequestTimingMiddleware
+from app.core.password_hasher import password_hasher
+from app.core.session_bus import session_bus
+from app.core.startup import startup
+from app.services.email_service import close_email_client
+from app.services.outbox_service import run_outbox_worker
+from app.services.search_index import build_user_search_index, user_search_index
+from app.services.user_service import reconcile_user_counts_periodically
 from fastapi.middleware.cors import CORSMiddleware
 
 prefix = settings.prefix
 origins = settings.BACKEND_CORS_ORIGINS
 
-init_db()
-app = FastAPI(title="FastAPI Firebase Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Backends initialize in the background; /readyz reports when they are done
+    startup_task = startup.start()
+    reconcile_task = asyncio.create_task(
+        startup.after("firestore", reconcile_user_counts_periodically, settings.USER_COUNTS_RECONCILE_SECONDS)
+    )
+    outbox_task = asyncio.create_task(startup.after("postgres", run_outbox_worker)) if settings.OUTBOX_WORKER_ENABLED else None
+    session_bus_task = asyncio.create_task(session_bus.run()) if session_bus.enabled else None
+    search_index_task = asyncio.create_task(startup.after("firestore", build_user_search_index))
+    yield
+    startup_task.cancel()
+    reconcile_task.cancel()
+    if outbox_task:
+        outbox_task.cancel()
+    if session_bus_task:
+        session_bus_task.cancel()
+    search_index_task.cancel()
+    user_search_index.stop()
+    await close_email_client()
+    password_hasher.shutdown()
+    await dispose_engines()
+
+app = FastAPI(title="FastAPI Firebase Backend", lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -18,8 +51,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)  # Inside AuthMiddleware, which identifies the superadmin
 app.add_middleware(AuthMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+app.add_middleware(RequestTimingMiddleware)  # Outside AuthMiddleware, so the session check is timed
+app.add_middleware(MetricsMiddleware)  # Outermost, so latency covers authentication and compression
 
+app.include_router(health.router)
 app.include_router(admin.router, prefix=prefix)
 app.include_router(auth.router, prefix=prefix)
 app.include_router(users.router, prefix=prefix)
@@ -33,4 +71,6 @@ def root():
 
 @app.head("/")
 def root():
-    return {}
\ No newline at end of file
+    return {}
+
+startup.mark_imported()
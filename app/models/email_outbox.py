@@ -0,0 +1,30 @@
+from datetime import datetime
+import enum
+from sqlalchemy import Column, DateTime, Enum as SQLAlchemyEnum, Index, Integer, String, Text
+from app.models.user import Base
+
+# Outbox message states
+class OutboxStatus(enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+# Database model, timestamps in naive UTC
+class EmailOutbox(Base):
+    """A rendered email waiting to be delivered by the outbox worker."""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(SQLAlchemyEnum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest time the message may be (re)claimed: retry backoff while pending, lease expiry while sending
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from dataclasses import dataclass, fields
+from pydantic import BaseModel, EmailStr, Field, validator
+from typing import List, Literal, Optional
 
 class FirebaseUser(BaseModel):
     uid: Optional[str] = None 
@@ -13,3 +14,102 @@ class FirebaseUser(BaseModel):
     @validator("npi", pre=True)
     def stringify_npi(cls, v):
         return None if v is None else str(v)
+
+# Upper bound on identifiers per batch request
+MAX_BATCH_GET = 500
+
+class BatchGetRequest(BaseModel):
+    uids: List[str] = Field(default_factory=list, max_length=MAX_BATCH_GET)
+    emails: List[EmailStr] = Field(default_factory=list, max_length=MAX_BATCH_GET)
+
+class BatchGetResponse(BaseModel):
+    users: List[FirebaseUser]
+    not_found: List[str]
+
+# Upper bound on rows per bulk onboarding request
+MAX_BULK_CREATE = 1000
+
+# Upper bound on a CSV roster upload: MAX_BULK_CREATE rows of up to 1 KiB each
+MAX_BULK_CSV_BYTES = MAX_BULK_CREATE * 1024
+
+class BulkCreateResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    uid: Optional[str] = None
+    created: bool = False
+    email_queued: bool = False
+    error: Optional[str] = None
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkCreateResult]
+
+# Upper bound on users touched by one bulk status change or delete
+MAX_BULK_UPDATE = 2000
+
+class BulkUserFilter(BaseModel):
+    status: Optional[Literal["active", "on_hold"]] = None
+    practice_name: Optional[str] = None
+
+class BulkSelectionRequest(BaseModel):
+    """Select users either by explicit UIDs or by a status/practice filter."""
+    uids: List[str] = Field(default_factory=list, max_length=MAX_BULK_UPDATE)
+    filter: Optional[BulkUserFilter] = None
+
+class BulkStatusRequest(BulkSelectionRequest):
+    action: Literal["approve", "hold"]
+
+class BulkUserOutcome(BaseModel):
+    uid: str
+    ok: bool
+    error: Optional[str] = None
+
+class BulkActionResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkUserOutcome]
+
+@dataclass(slots=True)
+class UserListRow:
+    """Compact row for the users list, built from a projected Firestore document."""
+    uid: str = "Unknown"
+    email: str = "Unknown"
+    first_name: str = "Unknown"
+    last_name: str = "Unknown"
+    practice_name: str = "Unknown"
+    npi: str = "Unknown"
+    status: str = "active"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserListRow":
+        row = cls(*[data.get(name, default) for name, default in _USER_LIST_DEFAULTS])
+        # Some documents store npi as a number; stringified like FirebaseUser.stringify_npi
+        if row.npi is not None:
+            row.npi = str(row.npi)
+        return row
+
+# Precomputed (field, default) pairs; also the Firestore select() projection for list queries
+_USER_LIST_DEFAULTS = tuple((field.name, field.default) for field in fields(UserListRow))
+USER_LIST_FIELDS = [name for name, _ in _USER_LIST_DEFAULTS]
+
+class UserSearchResponse(BaseModel):
+    users: List[UserListRow]
+    total_matches: int
+
+class UserListResponse(BaseModel):
+    users: List[UserListRow]
+    next_page_uid: Optional[str] = None
+    total_count: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class UserLookupResponse(BaseModel):
+    """Users matching an email lookup; empty when none does."""
+    users: List[FirebaseUser]
+
+class UserCreatedResponse(BaseModel):
+    user_id: str
+
+class PasswordResetLinkResponse(BaseModel):
+    reset_link: str
@@ -0,0 +1,11 @@
+from typing import Any, Dict
+from pydantic import BaseModel
+
+class HealthResponse(BaseModel):
+    status: str
+
+class ReadinessResponse(BaseModel):
+    """Overall status, per-dependency probe results and startup timings."""
+    status: str
+    checks: Dict[str, Dict[str, Any]]
+    startup: Dict[str, Any]
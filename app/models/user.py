@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Enum as SQLAlchemyEnum
 from sqlalchemy.ext.declarative import declarative_base
 import enum
+from typing import Any, Dict
 from pydantic import BaseModel, EmailStr
 
 Base = declarative_base()
@@ -43,3 +44,17 @@ class TokenResponse(BaseModel):
     """Schema for token response."""
     access_token: str
     token_type: str = "bearer"
+
+class MessageResponse(BaseModel):
+    """Schema for responses that only confirm an action."""
+    message: str
+
+class AdminStatsResponse(BaseModel):
+    """Schema for in-process statistics; each section is reported by its own component."""
+    session_cache: Dict[str, Any]
+    session_bus: Dict[str, Any]
+    auth_user_cache: Dict[str, Any]
+    password_hasher: Dict[str, Any]
+    search_index: Dict[str, Any]
+    email_outbox: Dict[str, Any]
+    startup: Dict[str, Any]
@@ -1,15 +1,31 @@
 from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.core.security import verify_password, create_access_token, hash_password, verify_access_token
-from app.services.user_service import get_admin_by_email
-from app.core.config import settings
+from app.core.database import run_db
+from app.core.password_hasher import password_hasher
+from app.core.security import create_access_token
+from app.core.session_bus import publish_session_change, publish_session_change_async
+from app.services.user_service import (
+    get_admin_by_email,
+    get_admin_by_email_async,
+    store_admin_password_hash,
+    store_admin_password_hash_async,
+)
+from app.core.config import settings, logger
+from app.core.session_cache import session_cache
 
-def authenticate_admin(db: Session, email: str, password: str) -> User | None:
-    """Authenticates an admin using email and password."""
-    admin = get_admin_by_email(db, email)
-    if not admin or not verify_password(password, admin.hashed_password):
+async def authenticate_admin(db: Session | AsyncSession, email: str, password: str) -> User | None:
+    """Authenticates an admin using email and password, rehashing when the bcrypt cost has changed."""
+    admin = await run_db(get_admin_by_email, get_admin_by_email_async, db, email)
+    if not admin:
         return None
+    verified, new_hash = await password_hasher.verify_and_update(password, admin.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        await run_db(store_admin_password_hash, store_admin_password_hash_async, db, admin, new_hash)
+        logger.info(f"🔐 Upgraded password hash for: {admin.email}")
     return admin
 
 def generate_admin_access_token(admin: User) -> str:
@@ -24,9 +40,27 @@ def save_session_token(db: Session, user: User, token: str) -> bool:
     """
     try:
         user.session_token = token  # Assign the provided token
+        publish_session_change(db, user.email)  # Other workers drop the previous session on commit
         db.commit()  # Save changes
         db.refresh(user)  # Refresh user object
+        session_cache.invalidate_email(user.email)  # Drop the previous session
         return True
     except Exception:
         db.rollback()  # Roll back in case of an error
         return False
+
+async def save_session_token_async(db: AsyncSession, user: User, token: str) -> bool:
+    """
+    Saves the given session token for the user in the database.
+    If the operation is successful, returns True; otherwise, returns False.
+    """
+    try:
+        user.session_token = token  # Assign the provided token
+        await publish_session_change_async(db, user.email)  # Other workers drop the previous session on commit
+        await db.commit()  # Save changes
+        await db.refresh(user)  # Refresh user object
+        session_cache.invalidate_email(user.email)  # Drop the previous session
+        return True
+    except Exception:
+        await db.rollback()  # Roll back in case of an error
+        return False
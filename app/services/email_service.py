@@ -1,29 +1,137 @@
-import requests
-from app.core.config import settings
+import asyncio
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+import httpx
+from app.core.config import settings, logger
+from app.core.metrics import EMAIL_SEND_FAILURES, EMAIL_SEND_RETRIES, EMAIL_SEND_SECONDS
+from app.core.timing import request_span
 
 RESEND_API_KEY = settings.RESEND_API_KEY
-RESEND_API_URL = "https://api.resend.com/emails"
+RESEND_API_URL = settings.RESEND_API_URL.rstrip("/")
 SENDER_EMAIL = settings.SENDER_ADDRESS
 
-def send_email(recipient: str, subject: str, body: str):
+# Resend accepts at most 100 messages per batch request
+RESEND_BATCH_LIMIT = 100
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Longest Retry-After honoured in-process; longer waits are left to the outbox's backoff
+MAX_RETRY_AFTER_SECONDS = 30
+
+# Pooled keep-alive client, created on first use
+_async_client: httpx.AsyncClient | None = None
+
+def _client_options() -> dict:
     if not RESEND_API_KEY or not SENDER_EMAIL:
         raise ValueError("Resend API key or sender email is not set")
-
-    headers = {
-        "Authorization": f"Bearer {RESEND_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    data = {
-        "from": SENDER_EMAIL,
-        "to": [recipient],
-        "subject": subject,
-        "html": body,
+    return {
+        "base_url": RESEND_API_URL,
+        "headers": {"Authorization": f"Bearer {RESEND_API_KEY}"},
+        "timeout": httpx.Timeout(settings.RESEND_READ_TIMEOUT, connect=settings.RESEND_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(max_connections=settings.RESEND_MAX_CONNECTIONS, max_keepalive_connections=settings.RESEND_MAX_CONNECTIONS),
     }
 
-    response = requests.post(RESEND_API_URL, json=data, headers=headers)
-    response.raise_for_status()
+def get_async_email_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**_client_options())
+    return _async_client
+
+async def close_email_client():
+    """Closes the pooled client; called on application shutdown."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
 
-    return response.json()
+def _message(recipient: str, subject: str, body: str) -> dict:
+    return {"from": SENDER_EMAIL, "to": [recipient], "subject": subject, "html": body}
+
+def _retry_delay(attempt: int, response: httpx.Response | None, deadline: float | None) -> float | None:
+    """
+    Seconds to wait before the next attempt, or None if the failure should not be retried, including
+    when the wait plus another attempt would pass `deadline` (a time.monotonic() value).
+    """
+    if attempt >= settings.RESEND_MAX_RETRIES:
+        return None
+    delay = settings.RESEND_RETRY_BACKOFF * (2 ** attempt) * (1 + random.random())
+    if response is not None:
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+    attempt_seconds = settings.RESEND_CONNECT_TIMEOUT + settings.RESEND_READ_TIMEOUT
+    if deadline is not None and time.monotonic() + delay + attempt_seconds > deadline:
+        return None
+    return delay
+
+@contextmanager
+def _observed(path: str):
+    """Records a Resend request's latency, retries included, and whether it finally failed."""
+    started = time.perf_counter()
+    try:
+        with request_span("resend"):
+            yield
+    except Exception:
+        EMAIL_SEND_FAILURES.labels(path).inc()
+        raise
+    finally:
+        EMAIL_SEND_SECONDS.labels(path).observe(time.perf_counter() - started)
+
+async def _post_async(path: str, payload, idempotency_key: str, deadline: float | None = None) -> dict:
+    # The idempotency key makes a retried request safe if the first attempt reached Resend
+    headers = {"Idempotency-Key": idempotency_key}
+    with _observed(path):
+        attempt = 0
+        while True:
+            try:
+                response = await get_async_email_client().post(path, json=payload, headers=headers)
+                if response.is_success:
+                    return response.json()
+                delay = _retry_delay(attempt, response, deadline)
+                if delay is None:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                delay = _retry_delay(attempt, None, deadline)
+                if delay is None:
+                    raise
+            logger.warning(f"📧 Resend {path} attempt {attempt + 1} failed; retrying in {delay:.2f}s")
+            EMAIL_SEND_RETRIES.labels(path).inc()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+async def send_email_async(recipient: str, subject: str, body: str, idempotency_key: str, deadline: float | None = None):
+    """
+    Sends one email, retrying transient failures until `deadline`. Resend ignores a repeated
+    `idempotency_key` for 24 hours, so a message must keep its key across redeliveries.
+    """
+    return await _post_async("/emails", _message(recipient, subject, body), idempotency_key, deadline)
+
+def _batch_key(keys: list[str]) -> str:
+    """Idempotency key for a batch request, the same for the same messages in any order."""
+    return "batch-" + hashlib.sha256("\n".join(sorted(keys)).encode()).hexdigest()
+
+async def send_batch_emails_async(messages: list[tuple[str, str, str, str]], deadline: float | None = None) -> list:
+    """
+    Sends (idempotency key, recipient, subject, body) messages through Resend's batch endpoint,
+    100 per request, chunks in parallel; each request's key is derived from its messages' keys.
+    Returns, per chunk and in order, the Resend response or the exception raised.
+    """
+    chunks = [messages[i:i + RESEND_BATCH_LIMIT] for i in range(0, len(messages), RESEND_BATCH_LIMIT)]
+    return await asyncio.gather(
+        *(
+            _post_async(
+                "/emails/batch",
+                [_message(*message) for _, *message in chunk],
+                _batch_key([key for key, *_ in chunk]),
+                deadline,
+            )
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
 
 def onboarding_email(provider_name: str, reset_link: str) -> tuple[str, str]:
     """Generates the onboarding email for regular users."""
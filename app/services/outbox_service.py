@@ -0,0 +1,217 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+import httpx
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings, logger
+from app.core.database import get_async_db_context, get_db_context
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services.email_service import RESEND_BATCH_LIMIT, send_batch_emails_async, send_email_async
+
+# A rendered (recipient, subject, body) message
+Message = Tuple[str, str, str]
+
+# Longest wait between retries of one message
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+# In-process delivery counters, reported next to the queue depth
+outbox_metrics = {"delivered": 0, "retried": 0, "dead_lettered": 0}
+
+# ---------------- ENQUEUE ----------------
+
+def add_to_outbox(db, messages: List[Message]):
+    """Adds messages to the caller's transaction; they are delivered once it commits."""
+    for recipient, subject, body in messages:
+        db.add(EmailOutbox(recipient=recipient, subject=subject, body=body))
+
+def enqueue_emails(db: Session, messages: List[Message]):
+    add_to_outbox(db, messages)
+    db.commit()
+
+async def enqueue_emails_async(db: AsyncSession, messages: List[Message]):
+    add_to_outbox(db, messages)
+    await db.commit()
+
+def _enqueue_in_new_session(messages: List[Message]):
+    with get_db_context() as db:
+        enqueue_emails(db, messages)
+
+async def queue_emails(messages: List[Message]):
+    """Enqueues messages in a transaction of their own, for callers without a database session."""
+    if not messages:
+        return
+    if settings.DB_ASYNC:
+        async with get_async_db_context() as db:
+            await enqueue_emails_async(db, messages)
+    else:
+        await run_in_threadpool(_enqueue_in_new_session, messages)
+    logger.info(f"📥 Queued {len(messages)} email(s)")
+
+# ---------------- DELIVERY ----------------
+
+def claim_outbox_batch(limit: int) -> List[tuple]:
+    """
+    Leases up to `limit` due messages, including ones whose previous lease expired, as
+    (id, recipient, subject, body, attempt) tuples. SKIP LOCKED lets several workers drain
+    the outbox without double sends. Attempts are counted here, so a message whose sending
+    keeps killing the worker is dead-lettered too.
+    """
+    now = datetime.utcnow()
+    with get_db_context() as db:
+        rows = (
+            db.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status.in_([OutboxStatus.PENDING, OutboxStatus.SENDING]),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        batch = []
+        for row in rows:
+            if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                # Only reachable when the lease of its last attempt expired without a result
+                row.status = OutboxStatus.DEAD
+                row.last_error = row.last_error or "Lease expired without a delivery result"
+                outbox_metrics["dead_lettered"] += 1
+                logger.error(f"💀 Email {row.id} to {row.recipient} dead-lettered after {row.attempts} unfinished attempts")
+                continue
+            row.attempts += 1
+            row.status = OutboxStatus.SENDING
+            row.next_attempt_at = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            batch.append((row.id, row.recipient, row.subject, row.body, row.attempts))
+        db.commit()
+    return batch
+
+def record_outbox_results(outcomes: dict):
+    """Marks delivered messages sent; failed ones are rescheduled with backoff or dead-lettered."""
+    now = datetime.utcnow()
+    with get_db_context() as db:
+        sent_ids = [message_id for message_id, error in outcomes.items() if error is None]
+        if sent_ids:
+            db.query(EmailOutbox).filter(EmailOutbox.id.in_(sent_ids)).update(
+                {"status": OutboxStatus.SENT, "sent_at": now, "last_error": None}, synchronize_session=False
+            )
+            outbox_metrics["delivered"] += len(sent_ids)
+
+        for message_id, error in outcomes.items():
+            if error is None:
+                continue
+            row = db.get(EmailOutbox, message_id)
+            row.last_error = error[:1000]
+            if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                row.status = OutboxStatus.DEAD
+                outbox_metrics["dead_lettered"] += 1
+                logger.error(f"💀 Email {message_id} to {row.recipient} dead-lettered after {row.attempts} attempts: {error}")
+            else:
+                row.status = OutboxStatus.PENDING
+                delay = timedelta(seconds=settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (row.attempts - 1))
+                row.next_attempt_at = now + min(delay, MAX_RETRY_DELAY)
+                outbox_metrics["retried"] += 1
+        db.commit()
+
+def _is_rejection(error: Exception) -> bool:
+    """A 4xx other than 429 means Resend refused the payload rather than being unavailable."""
+    return isinstance(error, httpx.HTTPStatusError) and 400 <= error.response.status_code < 500 and error.response.status_code != 429
+
+def _idempotency_key(message_id: int) -> str:
+    return f"outbox-{message_id}"
+
+async def _send_individually(messages: List[tuple], deadline: float, outcomes: dict):
+    """Sends each message on its own under its per-message key, recording {message_id: error or None}."""
+    results = await asyncio.gather(
+        *(
+            send_email_async(recipient, subject, body, _idempotency_key(message_id), deadline)
+            for message_id, recipient, subject, body, _ in messages
+        ),
+        return_exceptions=True,
+    )
+    for (message_id, *_), result in zip(messages, results):
+        outcomes[message_id] = str(result) if isinstance(result, Exception) else None
+
+async def deliver_outbox_batch(batch: List[tuple], deadline: float) -> dict:
+    """
+    Sends claimed messages, retrying until `deadline` (time.monotonic()) so no send outlives its lease;
+    returns {message_id: error or None}. First attempts go through the Resend batch endpoint. Every later
+    attempt is sent on its own under the message's stable `outbox-<id>` key: the set of messages claimed
+    together changes between attempts, so a batch key could not be reproduced for a retry.
+    """
+    first_attempts = [message for message in batch if message[4] == 1]
+    individual = [message for message in batch if message[4] > 1]
+
+    outcomes = {}
+    if first_attempts:
+        chunk_results = await send_batch_emails_async(
+            [(_idempotency_key(message_id), recipient, subject, body) for message_id, recipient, subject, body, _ in first_attempts],
+            deadline,
+        )
+        for index, (message_id, *_) in enumerate(first_attempts):
+            chunk_result = chunk_results[index // RESEND_BATCH_LIMIT]
+            outcomes[message_id] = str(chunk_result) if isinstance(chunk_result, Exception) else None
+
+        # A rejected batch fails as a whole; resend its messages one by one so a single bad message is isolated
+        individual += [
+            message for index, message in enumerate(first_attempts)
+            if _is_rejection(chunk_results[index // RESEND_BATCH_LIMIT])
+        ]
+    if individual:
+        await _send_individually(individual, deadline, outcomes)
+    return outcomes
+
+async def drain_outbox_once() -> int:
+    """Claims, sends and records one batch; returns how many messages were claimed."""
+    # Leave a margin for recording the results before another worker may reclaim the batch
+    deadline = time.monotonic() + settings.OUTBOX_LEASE_SECONDS * 0.8
+    batch = await run_in_threadpool(claim_outbox_batch, settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0
+    outcomes = await deliver_outbox_batch(batch, deadline)
+    await run_in_threadpool(record_outbox_results, outcomes)
+    failed = sum(1 for error in outcomes.values() if error)
+    logger.info(f"📤 Outbox delivered {len(batch) - failed} of {len(batch)} email(s)")
+    return len(batch)
+
+def prune_sent_emails(older_than: timedelta) -> int:
+    with get_db_context() as db:
+        deleted = db.query(EmailOutbox).filter(
+            EmailOutbox.status == OutboxStatus.SENT,
+            EmailOutbox.sent_at < datetime.utcnow() - older_than,
+        ).delete(synchronize_session=False)
+        db.commit()
+    return deleted
+
+async def run_outbox_worker():
+    """Drains the outbox until cancelled, polling when it is empty and pruning old sent messages hourly."""
+    last_pruned = 0.0
+    while True:
+        claimed = 0
+        try:
+            claimed = await drain_outbox_once()
+            if time.monotonic() - last_pruned > 3600:
+                await run_in_threadpool(prune_sent_emails, timedelta(days=settings.OUTBOX_RETENTION_DAYS))
+                last_pruned = time.monotonic()
+        except Exception:
+            logger.exception("❌ Error draining email outbox")
+        if claimed < settings.OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(settings.OUTBOX_POLL_SECONDS)
+
+# ---------------- METRICS ----------------
+
+def outbox_stats() -> dict:
+    """Queue depth by status, age of the oldest pending message and in-process delivery counters."""
+    with get_db_context() as db:
+        counts = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all())
+        oldest_pending = db.query(func.min(EmailOutbox.created_at)).filter(
+            EmailOutbox.status == OutboxStatus.PENDING
+        ).scalar()
+    return {
+        **{status.value: counts.get(status, 0) for status in OutboxStatus},
+        "oldest_pending_age_seconds": (datetime.utcnow() - oldest_pending).total_seconds() if oldest_pending else 0.0,
+        **outbox_metrics,
+    }
@@ -0,0 +1,307 @@
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings, logger
+from app.core.firebase import get_firestore_async_client, get_firestore_client
+from app.models.firebase_user import USER_LIST_FIELDS, UserListRow
+
+# Fields searched by /users/search
+SEARCH_FIELDS = ("first_name", "last_name", "practice_name", "npi", "email")
+
+# Shortest prefix indexed; shorter query terms are ignored since they would match most users
+MIN_PREFIX = 2
+
+# Longest wait for the users listener's first snapshot before the build is retried
+INITIAL_SNAPSHOT_TIMEOUT_SECONDS = 300
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def _status_key(status: str) -> str:
+    """Posting key for a status; cannot collide with tokens, which are alphanumeric."""
+    return f"status:{status}"
+
+
+def tokenize(value) -> set:
+    """Lowercase alphanumeric words of a field value; emails also keep their full address."""
+    if value is None:
+        return set()
+    text = str(value).lower()
+    tokens = {token for token in _TOKEN_SPLIT.split(text) if token}
+    if "@" in text:
+        tokens.add(text)
+    return tokens
+
+
+class UserSearchIndex:
+    """
+    In-process inverted index mapping every prefix (from MIN_PREFIX characters) of each
+    searchable word to the uids containing it. A query matches users having every
+    term as a word prefix, so lookups are a few set intersections and no Firestore reads.
+
+    While listening it also knows each document's Firestore update_time, counts collection
+    changes and follows the stats/user_counts totals, which lets the users endpoints answer
+    revalidations without reads.
+    """
+
+    def __init__(self):
+        self._rows: dict[str, UserListRow] = {}
+        self._prefixes_by_uid: dict[str, set] = {}
+        self._postings: dict[str, set] = {}
+        self._sort_keys: dict[str, tuple] = {}
+        self._update_times: dict[str, datetime] = {}
+        self._ordered: list | None = None  # All uids by sort key, rebuilt lazily after writes
+        self._lock = threading.Lock()
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.updates = 0
+        self._instance = uuid.uuid4().hex[:8]  # Scopes `updates` to this process in collection versions
+        self._watch = None
+        self._initial_snapshot = None  # (loop, future) resolved by the users listener's first callback
+        self._counts_watch = None
+        self._counts_update_time: Optional[datetime] = None
+
+    # ---------------- MAINTENANCE ----------------
+
+    def _prefixes(self, row: UserListRow) -> set:
+        prefixes = set()
+        for field in SEARCH_FIELDS:
+            for token in tokenize(getattr(row, field)):
+                prefixes.update(token[:length] for length in range(MIN_PREFIX, len(token) + 1))
+        prefixes.add(_status_key(row.status))
+        return prefixes
+
+    def _remove(self, uid: str):
+        for prefix in self._prefixes_by_uid.pop(uid, ()):
+            uids = self._postings.get(prefix)
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del self._postings[prefix]
+        self._rows.pop(uid, None)
+        self._sort_keys.pop(uid, None)
+        self._update_times.pop(uid, None)
+        self._ordered = None
+
+    def _upsert(self, uid: str, data: dict, merge: bool = True, update_time: Optional[datetime] = None):
+        current = self._rows.get(uid) if merge else None
+        data = {field: value for field, value in data.items() if value is not None}
+        merged = {**asdict(current), **data} if current else data
+        merged["uid"] = uid
+        row = UserListRow.from_dict(merged)
+        self._remove(uid)
+        prefixes = self._prefixes(row)
+        for prefix in prefixes:
+            self._postings.setdefault(prefix, set()).add(uid)
+        self._prefixes_by_uid[uid] = prefixes
+        self._rows[uid] = row
+        self._sort_keys[uid] = (row.last_name.lower(), row.first_name.lower(), uid)
+        if update_time is not None:
+            self._update_times[uid] = update_time
+        self._ordered = None
+
+    def upsert(self, uid: str, data: dict, merge: bool = True, update_time: Optional[datetime] = None):
+        """
+        Indexes a user; with `merge`, partial updates (e.g. only `status`) keep the other indexed fields.
+        Own writes pass no `update_time`, leaving the document's version unknown until the listener reports it.
+        """
+        with self._lock:
+            self._upsert(uid, data, merge, update_time)
+            self.updates += 1
+
+    def remove(self, *uids: str):
+        with self._lock:
+            for uid in uids:
+                self._remove(uid)
+            self.updates += 1
+
+    def replace_all(self, documents: dict, update_times: Optional[dict] = None):
+        """Rebuilds the index from {uid: data}, and optionally {uid: update_time}, in one swap."""
+        update_times = update_times or {}
+        fresh = UserSearchIndex()
+        for uid, data in documents.items():
+            fresh._upsert(uid, data, merge=False, update_time=update_times.get(uid))
+        with self._lock:
+            self._rows, self._prefixes_by_uid, self._postings = fresh._rows, fresh._prefixes_by_uid, fresh._postings
+            self._sort_keys, self._update_times, self._ordered = fresh._sort_keys, fresh._update_times, None
+            self.updates += 1
+            self.ready = True
+            self.built_at = time.time()
+
+    # ---------------- QUERIES ----------------
+
+    def search(self, query: str, status: Optional[str] = None, limit: int = 20) -> dict:
+        """Returns up to `limit` rows matching every query term as a prefix, ordered by last and first name."""
+        keys = [term for term in tokenize(query) if len(term) >= MIN_PREFIX]
+        if not keys:
+            return {"users": [], "total_matches": 0}
+        if status and status != "all":
+            keys.append(_status_key(status))
+
+        with self._lock:
+            postings = [self._postings.get(key) for key in keys]
+            if not all(postings):
+                return {"users": [], "total_matches": 0}
+            matches = postings[0] if len(postings) == 1 else set.intersection(*sorted(postings, key=len))
+
+            if len(matches) * 8 >= len(self._rows):
+                # Broad query: walk the global order, which finds `limit` matches quickly
+                if self._ordered is None:
+                    self._ordered = sorted(self._sort_keys, key=self._sort_keys.__getitem__)
+                top = list(itertools.islice((uid for uid in self._ordered if uid in matches), limit))
+            else:
+                top = heapq.nsmallest(limit, matches, key=self._sort_keys.__getitem__)
+            return {"users": [self._rows[uid] for uid in top], "total_matches": len(matches)}
+
+    def listening(self) -> bool:
+        """
+        True while both listeners are streaming. A Watch that hits a non-retryable error closes
+        itself, after which the index no longer sees other processes' writes.
+        """
+        return all(watch is not None and watch.is_active for watch in (self._watch, self._counts_watch))
+
+    def document_version(self, uid: str) -> Optional[datetime]:
+        """Firestore update_time of a user's document, or None unless known and kept current by the listener."""
+        if not self.listening():
+            return None
+        with self._lock:
+            return self._update_times.get(uid)
+
+    def record_document_version(self, uid: str, update_time: datetime, collection_version: Optional[str]):
+        """
+        Keeps an update_time read straight from Firestore, so the next revalidation can skip the read.
+        Ignored if any write was seen since `collection_version` was taken before that read.
+        """
+        with self._lock:
+            if collection_version == self._version() and uid in self._rows:
+                self._update_times.setdefault(uid, update_time)
+
+    def _version(self) -> str:
+        counts_version = self._counts_update_time.isoformat() if self._counts_update_time else "cold"
+        return f"{self._instance}-{self.updates}-{counts_version}"
+
+    def collection_version(self) -> Optional[str]:
+        """
+        Changes with every users write and user_counts update seen by this process, since list
+        pages carry the totals; None unless the listeners are running.
+        """
+        if not self.listening():
+            return None
+        with self._lock:
+            return self._version()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "users": len(self._rows),
+                "prefixes": len(self._postings),
+                "updates": self.updates,
+                "listening": self.listening(),
+                "built_at": self.built_at,
+            }
+
+    # ---------------- FIRESTORE ----------------
+
+    def _on_snapshot(self, snapshots, changes, _read_time):
+        """
+        Runs on the Firestore listener thread; also receives this service's own writes. The first
+        call carries every document, which (re)builds the index instead of a separate full read.
+        """
+        initial = self._initial_snapshot
+        if initial is not None:
+            self._initial_snapshot = None
+            self.replace_all(
+                {snapshot.id: snapshot.to_dict() or {} for snapshot in snapshots},
+                {snapshot.id: snapshot.update_time for snapshot in snapshots},
+            )
+            loop, loaded = initial
+            loop.call_soon_threadsafe(lambda: loaded.done() or loaded.set_result(len(snapshots)))
+            return
+        for change in changes:
+            if change.type.name == "REMOVED":
+                self.remove(change.document.id)
+            else:
+                document = change.document
+                self.upsert(document.id, document.to_dict() or {}, merge=False, update_time=document.update_time)
+
+    def _on_counts_snapshot(self, snapshots, _changes, _read_time):
+        """Runs on the listener thread whenever stats/user_counts is written."""
+        with self._lock:
+            self._counts_update_time = snapshots[0].update_time if snapshots and snapshots[0].exists else None
+
+    async def build(self):
+        """
+        Builds the index from the users listener's initial snapshot, so the collection is read once;
+        without SEARCH_INDEX_LISTENER, from one streamed, projected read instead.
+        """
+        started = time.perf_counter()
+        if settings.SEARCH_INDEX_LISTENER:
+            client = get_firestore_client()
+            self._counts_watch = await run_in_threadpool(
+                client.collection("stats").document("user_counts").on_snapshot, self._on_counts_snapshot
+            )
+            loaded = asyncio.get_running_loop().create_future()
+            self._initial_snapshot = (asyncio.get_running_loop(), loaded)
+            self._watch = await run_in_threadpool(client.collection("users").on_snapshot, self._on_snapshot)
+            try:
+                users = await asyncio.wait_for(loaded, INITIAL_SNAPSHOT_TIMEOUT_SECONDS)
+            finally:
+                self._initial_snapshot = None
+            logger.info(f"🔎 Search index built: {users} users in {time.perf_counter() - started:.2f}s")
+            logger.info("📡 Search index listening for Firestore changes")
+            return
+
+        query = get_firestore_async_client().collection("users").select(USER_LIST_FIELDS)
+        documents, update_times = {}, {}
+        async for snapshot in query.stream():
+            documents[snapshot.id] = snapshot.to_dict()
+            update_times[snapshot.id] = snapshot.update_time
+        self.replace_all(documents, update_times)
+        logger.info(f"🔎 Search index built: {len(documents)} users in {time.perf_counter() - started:.2f}s")
+
+    def stop(self):
+        for watch in (self._watch, self._counts_watch):
+            if watch is not None:
+                watch.unsubscribe()
+        self._watch = self._counts_watch = None
+
+
+# Per-process provider search index
+user_search_index = UserSearchIndex()
+
+
+# How often the lifespan task checks that the Firestore listeners are still streaming
+LISTENER_CHECK_SECONDS = 30
+
+
+async def build_user_search_index():
+    """
+    Lifespan task: builds the index, retrying with backoff until it succeeds. While listening it
+    rebuilds the index if a listener dies, since the writes missed meanwhile never arrive.
+    """
+    backoff = 1
+    while True:
+        try:
+            await user_search_index.build()
+            if not settings.SEARCH_INDEX_LISTENER:
+                return
+            backoff = 1
+            while user_search_index.listening():
+                await asyncio.sleep(LISTENER_CHECK_SECONDS)
+            logger.warning("⚠️ Search index listener stopped, rebuilding the index")
+            user_search_index.stop()
+        except Exception:
+            logger.exception(f"❌ Error building search index, retrying in {backoff}s")
+            user_search_index.stop()  # A listener started before the failure would otherwise leak
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
@@ -1,31 +1,71 @@
-from datetime import timedelta
-from typing import List, Optional
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from pydantic import ValidationError
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from firebase_admin import auth
-from app.core.security import create_access_token, hash_password, verify_access_token, verify_password_reset_token
-from app.models.firebase_user import FirebaseUser
+from app.core.security import create_access_token, create_page_cursor, verify_access_token, verify_page_cursor, verify_password_reset_token
+from app.models.firebase_user import MAX_BULK_UPDATE, USER_LIST_FIELDS, BulkUserFilter, FirebaseUser
 from app.models.user import User, UserCreate, UserRole
 from app.core.security import generate_password_reset_token
 from app.core.firebase import (
-    create_user_in_firestore,
-    get_firebase_user,
-    get_firebase_user_by_uid,
-    get_firestore_client,
-    get_user_from_firestore,
-    update_user_in_firestore,
-    delete_user_from_firestore,
-    get_users_from_firestore,
+    adjust_user_counts_async,
+    find_user_in_firestore_by_email_async,
+    get_firebase_users_async,
+    get_users_from_firestore_by_ids_async,
+    write_users_batched_async,
+    delete_firebase_users_async,
+    find_users_in_firestore_async,
+    reconcile_user_counts_async,
+    create_user_in_firestore_async,
+    get_firebase_user_async,
+    get_firebase_user_by_uid_async,
+    call_auth_async,
+    get_firebase_auth,
+    get_user_from_firestore_async,
+    get_user_snapshot_from_firestore_async,
+    update_user_in_firestore_async,
+    delete_user_from_firestore_async,
+    get_users_from_firestore_async,
+    stream_users_from_firestore_async,
 )
+from app.core.auth_user_cache import auth_user_cache
 from app.core.config import settings, logger
-from app.services.email_service import onboarding_email, onboarding_email_admin, reset_password_email, reset_password_email_admin, send_email
+from app.core.database import run_db
+from app.core.password_hasher import password_hasher
+from app.core.session_bus import publish_session_change, publish_session_change_async
+from app.core.session_cache import session_cache
+from app.services.email_service import (
+    onboarding_email,
+    onboarding_email_admin,
+    reset_password_email,
+    reset_password_email_admin,
+)
+from app.services.search_index import user_search_index
+from app.services.outbox_service import add_to_outbox, enqueue_emails, enqueue_emails_async, queue_emails
+
+
+# Neon PostgreSQL: List dashboard admins
+def list_admins(db: Session) -> List[User]:
+    return db.query(User).all()
 
-db_firestore = get_firestore_client()
+async def list_admins_async(db: AsyncSession) -> List[User]:
+    result = await db.execute(select(User))
+    return list(result.scalars().all())
 
 # Neon PostgreSQL: Get dashboard admin by email
 def get_admin_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+async def get_admin_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
 # Neon PostgreSQL: Create dashboard admin
 def create_admin(db: Session, user_data: UserCreate):
     try:
@@ -34,16 +74,16 @@ def create_admin(db: Session, user_data: UserCreate):
             hashed_password=user_data.email,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
 
         # Generate a password reset link
         reset_token = generate_password_reset_token(db_user.email)
         reset_link = f"{settings.FRONTEND_URL}/auth/reset-password?token={reset_token}"
         
-        # Get onboarding email content for admin
+        # Queue the onboarding email in the same transaction as the admin
         subject, body = onboarding_email_admin(db_user.email, reset_link)
-        send_email(db_user.email, subject, body)
+        add_to_outbox(db, [(db_user.email, subject, body)])
+        db.commit()
+        db.refresh(db_user)
 
         logger.info(f"✅ Admin created: {user_data.email}")
         return db_user
@@ -52,23 +92,69 @@ def create_admin(db: Session, user_data: UserCreate):
         logger.exception("❌ Error creating admin")
         raise e
 
-def set_admin_password(db: Session, token: str, new_password: str) -> User:
-    """Updates an admin's password if a valid token is provided."""
+async def create_admin_async(db: AsyncSession, user_data: UserCreate):
+    try:
+        db_user = User(
+            email=user_data.email,
+            hashed_password=user_data.email,
+        )
+        db.add(db_user)
+
+        # Generate a password reset link
+        reset_token = generate_password_reset_token(db_user.email)
+        reset_link = f"{settings.FRONTEND_URL}/auth/reset-password?token={reset_token}"
+
+        # Queue the onboarding email in the same transaction as the admin
+        subject, body = onboarding_email_admin(db_user.email, reset_link)
+        add_to_outbox(db, [(db_user.email, subject, body)])
+        await db.commit()
+        await db.refresh(db_user)
+
+        logger.info(f"✅ Admin created: {user_data.email}")
+        return db_user
+    except Exception as e:
+        await db.rollback()
+        logger.exception("❌ Error creating admin")
+        raise e
+
+def store_admin_password_hash(db: Session, admin: User, hashed_password: str, revoke_sessions: bool = False) -> User:
+    admin.hashed_password = hashed_password
+    if revoke_sessions:
+        admin.session_token = None
+        publish_session_change(db, admin.email)
+    db.commit()
+    db.refresh(admin)
+    if revoke_sessions:
+        session_cache.invalidate_email(admin.email)
+    return admin
+
+async def store_admin_password_hash_async(db: AsyncSession, admin: User, hashed_password: str, revoke_sessions: bool = False) -> User:
+    admin.hashed_password = hashed_password
+    if revoke_sessions:
+        admin.session_token = None
+        await publish_session_change_async(db, admin.email)
+    await db.commit()
+    await db.refresh(admin)
+    if revoke_sessions:
+        session_cache.invalidate_email(admin.email)
+    return admin
+
+async def set_admin_password(db: Session | AsyncSession, token: str, new_password: str) -> User:
+    """Updates an admin's password if a valid token is provided, hashing on the bcrypt executor."""
     email = verify_password_reset_token(token)
     
     if not email:
         raise HTTPException(status_code=400, detail="Invalid token")
 
-    admin = get_admin_by_email(db, email)
+    admin = await run_db(get_admin_by_email, get_admin_by_email_async, db, email)
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
-    # Hash and update password
-    admin.hashed_password = hash_password(new_password)
-    db.commit()
-    db.refresh(admin)
-    
-    return admin
+    # Hash and update password, signing the admin out everywhere
+    hashed_password = await password_hasher.hash(new_password)
+    return await run_db(
+        store_admin_password_hash, store_admin_password_hash_async, db, admin, hashed_password, revoke_sessions=True
+    )
 
 def send_admin_reset_password_email(db: Session, email: str):
     """Sends a password reset email to the admin."""
@@ -82,7 +168,23 @@ def send_admin_reset_password_email(db: Session, email: str):
 
     # Get reset password email content for admin
     subject, body = reset_password_email_admin(email, reset_link)
-    send_email(email, subject, body)
+    enqueue_emails(db, [(email, subject, body)])
+
+    return {"message": "Password reset email sent"}
+
+async def send_admin_reset_password_email_async(db: AsyncSession, email: str):
+    """Sends a password reset email to the admin."""
+    admin = await get_admin_by_email_async(db, email)
+    if not admin:
+        raise HTTPException(status_code=404, detail="Admin not found")
+
+    # Generate a reset token
+    reset_token = generate_password_reset_token(email)
+    reset_link = f"{settings.FRONTEND_URL}/auth/reset-password?token={reset_token}"
+
+    # Get reset password email content for admin
+    subject, body = reset_password_email_admin(email, reset_link)
+    await enqueue_emails_async(db, [(email, subject, body)])
 
     return {"message": "Password reset email sent"}
 
@@ -94,7 +196,9 @@ def delete_admin_by_email(db: Session, email: str):
     
     try:
         db.delete(admin)
+        publish_session_change(db, email)
         db.commit()
+        session_cache.invalidate_email(email)
         logger.info(f"🗑️ Admin deleted: {email}")
         return {"message": f"Admin with email {email} has been deleted successfully"}
     except Exception as e:
@@ -102,17 +206,48 @@ def delete_admin_by_email(db: Session, email: str):
         logger.exception("❌ Error deleting admin")
         raise e
 
+async def delete_admin_by_email_async(db: AsyncSession, email: str):
+    admin = await get_admin_by_email_async(db, email)
+    if not admin:
+        raise ValueError("Admin not found")
+
+    try:
+        await db.delete(admin)
+        await publish_session_change_async(db, email)
+        await db.commit()
+        session_cache.invalidate_email(email)
+        logger.info(f"🗑️ Admin deleted: {email}")
+        return {"message": f"Admin with email {email} has been deleted successfully"}
+    except Exception as e:
+        await db.rollback()
+        logger.exception("❌ Error deleting admin")
+        raise e
+
+def _status_change_deltas(previous_status: Optional[str], new_status: str) -> dict:
+    """Counter increments for moving a user from one status to another."""
+    if previous_status == new_status:
+        return {}
+    deltas = {new_status: 1}
+    if previous_status:
+        deltas[previous_status] = -1
+    return deltas
+
 # Firebase: Get user by email
-def get_user_by_email(email: str) -> dict:
-    """Retrieve a user's details using their email from Firebase Authentication and Firestore."""
+async def get_user_by_email(email: str) -> dict:
+    """Retrieve a user's details using their email from Firestore, falling back to Firebase Authentication."""
     try:
-        # Fetch user from Firebase Authentication
-        firebase_user = get_firebase_user(email)
+        # Single round trip: query the Firestore users collection by email
+        firestore_user = await find_user_in_firestore_by_email_async(email)
+        if firestore_user:
+            return {"users": [firestore_user]}
+
+        # Documents whose email field is missing or differs from Auth are resolved through Auth
+        firebase_user = await get_firebase_user_async(email)
         if not firebase_user:
             return {"users": []}  # Return empty array if user not found
 
         # Fetch user details from Firestore
-        firestore_user = get_user_from_firestore(firebase_user.uid)
+        firestore_user = await get_user_from_firestore_async(firebase_user.uid)
 
         if not firestore_user:
             return {"users": []}  # Return empty array if no Firestore data
@@ -122,54 +257,155 @@ def get_user_by_email(email: str) -> dict:
         logger.exception(f"❌ Error fetching user details for email: {email}")
         raise e
 
-def get_user_by_uid(uid: str) -> Optional[FirebaseUser]:
+async def get_user_by_uid(uid: str) -> Optional[FirebaseUser]:
     """Retrieve a user's details using their UID from Firebase Authentication and Firestore."""
-    try:
-        # Fetch user from Firebase Authentication using UID
-        firebase_user = get_firebase_user_by_uid(uid)
-        if not firebase_user:
-            return None
+    user, _ = await get_user_by_uid_with_version(uid)
+    return user
 
-        # Fetch user details from Firestore
-        firestore_user = get_user_from_firestore(firebase_user.uid)
+async def get_user_by_uid_with_version(uid: str) -> Tuple[Optional[FirebaseUser], Optional[datetime]]:
+    """Like get_user_by_uid, also returning the Firestore document's update_time for ETags."""
+    try:
+        # The UID keys both lookups, so run them concurrently
+        firebase_user, user_doc = await asyncio.gather(
+            get_firebase_user_by_uid_async(uid),
+            get_user_snapshot_from_firestore_async(uid),
+        )
 
-        if not firestore_user:
-            return None
+        if not firebase_user or not user_doc.exists:
+            return None, None
 
-        return FirebaseUser(**firestore_user)
+        return FirebaseUser(**user_doc.to_dict()), user_doc.update_time
     except Exception as e:
         logger.exception(f"❌ Error fetching user details for UID: {uid}")
         raise e
 
+# Firebase: Resolve many users at once
+async def get_users_batch(uids: List[str], emails: List[str]) -> dict:
+    """Resolve users by UID and email with chunked Auth get_users and one Firestore get_all, in input order."""
+    try:
+        auth = get_firebase_auth()
+        identifiers = [auth.UidIdentifier(uid) for uid in dict.fromkeys(uids)]
+        identifiers += [auth.EmailIdentifier(email) for email in dict.fromkeys(emails)]
+        firebase_users = await get_firebase_users_async(identifiers)
+
+        uid_by_email = {firebase_user.email.lower(): firebase_user.uid for firebase_user in firebase_users if firebase_user.email}
+        known_uids = {firebase_user.uid for firebase_user in firebase_users}
+        requested = [(uid, uid if uid in known_uids else None) for uid in uids]
+        requested += [(email, uid_by_email.get(email.lower())) for email in emails]
+
+        firestore_users = await get_users_from_firestore_by_ids_async(
+            list(dict.fromkeys(uid for _, uid in requested if uid))
+        )
+
+        users, not_found = [], []
+        for identifier, uid in requested:
+            if uid in firestore_users:
+                users.append(FirebaseUser(**firestore_users[uid]))
+            else:
+                not_found.append(identifier)
+
+        logger.info(f"📦 Batch resolved {len(users)} users ({len(not_found)} not found).")
+        return {"users": users, "not_found": not_found}
+    except Exception as e:
+        logger.exception("❌ Error batch fetching users")
+        raise e
+
 # Firebase: List users with pagination
-def list_users(limit: int = 30, last_uid: str = None, status: str = None):
+async def list_users(limit: int = 30, last_uid: str = None, status: str = None, cursor: str = None):
     try:
+        before_uid = None
+        if cursor:
+            page_cursor = verify_page_cursor(cursor)
+            if status and status != (page_cursor["status"] or "all"):
+                raise HTTPException(status_code=400, detail="Cursor does not match the status filter")
+            status = page_cursor["status"]
+            if page_cursor["dir"] == "next":
+                last_uid = page_cursor["uid"]
+            else:
+                before_uid = page_cursor["uid"]
+
         if status=="all":
-            users_data = get_users_from_firestore(limit=limit, last_uid=last_uid, status=None)
-        else:
-            users_data = get_users_from_firestore(limit=limit, last_uid=last_uid, status=status)
+            status = None
+        users_data = await get_users_from_firestore_async(limit=limit, last_uid=last_uid, status=status, before_uid=before_uid)
+
+        # Paging backward always leaves a page after this one; paging forward leaves one before it
+        has_more = users_data.pop("has_more")
+        has_next = has_more if not before_uid else True
+        has_prev = has_more if before_uid else bool(last_uid)
+        users = users_data["users"]
+        users_data["next_cursor"] = create_page_cursor(users[-1].uid, status, "next") if users and has_next else None
+        users_data["prev_cursor"] = create_page_cursor(users[0].uid, status, "prev") if users and has_prev else None
         return users_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("❌ Error fetching users")
         raise e
 
+# Firebase: Periodically correct drift in the maintained user counters
+async def reconcile_user_counts_periodically(interval_seconds: int):
+    while True:
+        try:
+            await reconcile_user_counts_async()
+        except Exception:
+            logger.exception("❌ Error reconciling user counters")
+        await asyncio.sleep(interval_seconds)
+
+# Rows buffered per chunk written to an export response
+EXPORT_FLUSH_ROWS = 100
+
+# Firebase: Export users as CSV or NDJSON
+async def export_users(export_format: str, status: str = None):
+    """Yield the users collection as CSV or NDJSON text chunks; memory stays bounded by one Firestore page."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(USER_LIST_FIELDS)
+
+    exported = 0
+    async for user in stream_users_from_firestore_async(status=status):
+        if user.get("npi") is not None:
+            user["npi"] = str(user["npi"])  # Some documents store npi as a number
+        row = [user.get(field) for field in USER_LIST_FIELDS]
+        if export_format == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(USER_LIST_FIELDS, row)), default=str) + "\n")
+        exported += 1
+        if exported % EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+    logger.info(f"📤 Exported {exported} users as {export_format} with status={status or 'any'}")
+
+# Provider search over the in-process index
+def search_users(query: str, status: str = None, limit: int = 20) -> dict:
+    """Prefix search by name, practice name, NPI or email; no Firestore reads."""
+    if not user_search_index.ready:
+        raise HTTPException(status_code=503, detail="Search index is still building", headers={"Retry-After": "5"})
+    return user_search_index.search(query, status=status, limit=limit)
+
 # Firebase: Create a new user
-def create_user_in_firebase(user_data: FirebaseUser):
+async def create_user_in_firebase(user_data: FirebaseUser):
     try:
         # Create user in Firebase Authentication
-        user = auth.create_user(email=user_data.email)
+        user = await call_auth_async("create_user", email=user_data.email)
         logger.info("Created auth user")
         user_data = user_data.model_copy(update={"uid": user.uid, "status": "active"})
 
         # Store user details in Firestore
-        create_user_in_firestore(user.uid, user_data.model_dump())
+        await create_user_in_firestore_async(user.uid, user_data.model_dump())
+        user_search_index.upsert(user.uid, user_data.model_dump(), merge=False)
+        await adjust_user_counts_async({"total": 1, "active": 1})
 
         # Send a password reset link
-        reset_link = auth.generate_password_reset_link(user_data.email)
+        reset_link = await call_auth_async("generate_password_reset_link", user_data.email)
         
         # Get onboarding email content
         subject, body = onboarding_email(user_data.first_name, reset_link)
-        send_email(user_data.email, subject, body)
+        await queue_emails([(user_data.email, subject, body)])
 
         logger.info(f"✅ User created in Firebase: {user_data.email}")
         return user.uid
@@ -177,8 +413,182 @@ def create_user_in_firebase(user_data: FirebaseUser):
         logger.exception(f"❌ Error creating Firebase user: {user_data.email}")
         raise e
 
+# Firebase: Parse a provider roster CSV into validated rows
+def parse_users_csv(content: str) -> Tuple[List[Tuple[int, FirebaseUser]], List[dict]]:
+    """Returns (row, user) pairs for valid rows and failed results for invalid ones; rows count from 0 after the header."""
+    users, failures = [], []
+    for row, record in enumerate(csv.DictReader(io.StringIO(content))):
+        record = {key.strip(): value.strip() for key, value in record.items() if key and value and value.strip()}
+        try:
+            users.append((row, FirebaseUser(**record)))
+        except ValidationError as e:
+            failures.append({"row": row, "email": record.get("email"), "error": f"Invalid row: {e.errors()[0]['msg']}"})
+    return users, failures
+
+# Firebase: Create many users with bounded concurrency
+async def create_users_in_firebase_bulk(users: List[Tuple[int, FirebaseUser]]) -> List[dict]:
+    """
+    Onboards (row, user) pairs: Auth accounts with bounded concurrency, Firestore documents in 500-write
+    batches, then onboarding emails queued in the outbox. Returns one result per row.
+    """
+    results = {row: {"row": row, "email": user_data.email} for row, user_data in users}
+
+    # 1. Firebase Authentication accounts
+    auth_limit = asyncio.Semaphore(settings.BULK_AUTH_CONCURRENCY)
+
+    async def create_auth_user(row: int, user_data: FirebaseUser):
+        async with auth_limit:
+            try:
+                user = await call_auth_async("create_user", email=user_data.email)
+                return row, user_data.model_copy(update={"uid": user.uid, "status": "active"})
+            except Exception as e:
+                results[row]["error"] = str(e)
+                return row, None
+
+    created = [
+        (row, user_data) for row, user_data in
+        await asyncio.gather(*(create_auth_user(row, user_data) for row, user_data in users))
+        if user_data
+    ]
+
+    # 2. Firestore documents; roll back Auth accounts whose batch failed
+    failed_uids = await write_users_batched_async([("set", user_data.uid, user_data.model_dump()) for _, user_data in created])
+    if failed_uids:
+        await call_auth_async("delete_users", list(failed_uids))
+    stored = []
+    for row, user_data in created:
+        if user_data.uid in failed_uids:
+            results[row]["error"] = "Failed to store user in Firestore"
+        else:
+            results[row].update(uid=user_data.uid, created=True)
+            stored.append((row, user_data))
+            user_search_index.upsert(user_data.uid, user_data.model_dump(), merge=False)
+    await adjust_user_counts_async({"total": len(stored), "active": len(stored)})
+
+    # 3. Onboarding emails: reset links with bounded concurrency, then one outbox insert
+    link_limit = asyncio.Semaphore(settings.BULK_EMAIL_CONCURRENCY)
+
+    async def onboarding_message(row: int, user_data: FirebaseUser):
+        async with link_limit:
+            try:
+                reset_link = await call_auth_async("generate_password_reset_link", user_data.email)
+                return row, (user_data.email, *onboarding_email(user_data.first_name, reset_link))
+            except Exception as e:
+                results[row]["error"] = f"Onboarding email failed: {e}"
+                return row, None
+
+    messages = [
+        (row, message) for row, message in
+        await asyncio.gather(*(onboarding_message(row, user_data) for row, user_data in stored))
+        if message
+    ]
+    try:
+        await queue_emails([message for _, message in messages])
+        for row, _ in messages:
+            results[row]["email_queued"] = True
+    except Exception as e:
+        logger.exception("❌ Error queueing onboarding emails")
+        for row, _ in messages:
+            results[row]["error"] = f"Onboarding email failed: {e}"
+
+    logger.info(f"✅ Bulk onboarding: {len(stored)} of {len(users)} users created")
+    return list(results.values())
+
+def summarize_bulk_create(results: List[dict]) -> dict:
+    results = sorted(results, key=lambda result: result["row"])
+    created = sum(1 for result in results if result.get("created"))
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+# Firebase: Resolve the users targeted by a bulk action
+async def _resolve_bulk_targets(uids: List[str], user_filter: Optional[BulkUserFilter]) -> dict:
+    """Returns {uid: Firestore data or None} for explicit UIDs, or for every user matching the filter."""
+    has_filter = user_filter is not None and (user_filter.status or user_filter.practice_name)
+    if bool(uids) == bool(has_filter):
+        raise HTTPException(status_code=400, detail="Provide either uids or a filter")
+
+    if uids:
+        uids = list(dict.fromkeys(uids))
+        user_docs = await get_users_from_firestore_by_ids_async(uids)
+        return {uid: user_docs.get(uid) for uid in uids}
+
+    # One past the cap is enough to reject a broad filter without reading every match
+    targets = await find_users_in_firestore_async(
+        status=user_filter.status, practice_name=user_filter.practice_name, fields=["uid", "status"], limit=MAX_BULK_UPDATE + 1
+    )
+    if len(targets) > MAX_BULK_UPDATE:
+        raise HTTPException(status_code=400, detail=f"Filter matches more than {MAX_BULK_UPDATE} users")
+    return targets
+
+def _summarize_bulk_action(outcomes: dict) -> dict:
+    results = [{"uid": uid, "ok": error is None, "error": error} for uid, error in outcomes.items()]
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+# Firebase: Approve or hold many users
+async def set_users_status_bulk(uids: List[str], user_filter: Optional[BulkUserFilter], action: str) -> dict:
+    """Applies approve/hold to many users: Auth updates in parallel, Firestore status in 500-write batches."""
+    new_status, disabled = ("active", False) if action == "approve" else ("on_hold", True)
+    targets = await _resolve_bulk_targets(uids, user_filter)
+    outcomes = {uid: (None if user_doc else "User not found") for uid, user_doc in targets.items()}
+
+    auth_limit = asyncio.Semaphore(settings.BULK_AUTH_CONCURRENCY)
+
+    async def update_auth_user(uid: str):
+        async with auth_limit:
+            try:
+                await call_auth_async("update_user", uid, disabled=disabled)
+                auth_user_cache.invalidate(uid)
+            except Exception as e:
+                outcomes[uid] = str(e)
+
+    await asyncio.gather(*(update_auth_user(uid) for uid, error in outcomes.items() if error is None))
+
+    updated = [uid for uid, error in outcomes.items() if error is None]
+    failed_uids = await write_users_batched_async([("update", uid, {"status": new_status}) for uid in updated])
+
+    deltas = {}
+    for uid in updated:
+        if uid in failed_uids:
+            outcomes[uid] = "Failed to update user in Firestore"
+            continue
+        user_search_index.upsert(uid, {"status": new_status})
+        for status, delta in _status_change_deltas(targets[uid].get("status"), new_status).items():
+            deltas[status] = deltas.get(status, 0) + delta
+    await adjust_user_counts_async(deltas)
+
+    summary = _summarize_bulk_action(outcomes)
+    logger.info(f"🔁 Bulk {action}: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    return summary
+
+# Firebase: Delete many users
+async def delete_users_in_firebase_bulk(uids: List[str], user_filter: Optional[BulkUserFilter]) -> dict:
+    """Deletes many users: Auth delete_users in 1000-uid chunks, Firestore documents in 500-write batches."""
+    targets = await _resolve_bulk_targets(uids, user_filter)
+    # Auth delete_users reports unknown uids as deleted, so only existing users are sent
+    outcomes = {uid: (None if user_doc else "User not found") for uid, user_doc in targets.items()}
+    existing = [uid for uid, error in outcomes.items() if error is None]
+    auth_failures = await delete_firebase_users_async(existing) if existing else {}
+    outcomes.update(auth_failures)
+
+    deleted = [uid for uid in existing if uid not in auth_failures]
+    failed_uids = await write_users_batched_async([("delete", uid, None) for uid in deleted])
+
+    deltas = {}
+    for uid in deleted:
+        if uid in failed_uids:
+            outcomes[uid] = "Failed to delete user from Firestore"
+            continue
+        user_search_index.remove(uid)
+        for key in ("total", targets[uid].get("status")):
+            deltas[key] = deltas.get(key, 0) - 1
+    await adjust_user_counts_async(deltas)
+
+    summary = _summarize_bulk_action(outcomes)
+    logger.info(f"🗑️ Bulk delete: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    return summary
+
 # Firebase: Update user details
-def update_user_in_firebase(user_id: str, update_data: dict):
+async def update_user_in_firebase(user_id: str, update_data: dict) -> FirebaseUser:
     try:
         # Extract email if it needs updating in Firebase Authentication
         firebase_update_data = {}
@@ -187,29 +597,34 @@ def update_user_in_firebase(user_id: str, update_data: dict):
         
         # Update email in Firebase Authentication (if present)
         if firebase_update_data:
-            auth.update_user(user_id, **firebase_update_data)
+            await call_auth_async("update_user", user_id, **firebase_update_data)
+            auth_user_cache.invalidate(user_id)
 
         # Update remaining details in Firestore (if present)
         if update_data:
-            update_user_in_firestore(user_id, update_data)
+            await update_user_in_firestore_async(user_id, update_data)
 
-        user_doc = get_user_from_firestore(user_id)
+        user_doc = await get_user_from_firestore_async(user_id)
 
         if not user_doc or "email" not in user_doc:
             raise ValueError(f"❌ No email found for user {user_id} in Firestore")
+        user_search_index.upsert(user_id, user_doc, merge=False)
 
-        updated_user = get_firebase_user(user_doc["email"])
-
-        return updated_user
+        return FirebaseUser(**user_doc)
     except Exception as e:
         logger.exception(f"❌ Error updating Firebase user: {user_id}")
         raise e
 
 # Firebase: Delete a user
-def delete_user_in_firebase(user_id: str):
+async def delete_user_in_firebase(user_id: str):
     try:
-        auth.delete_user(user_id)
-        delete_user_from_firestore(user_id)
+        user_doc = await get_user_from_firestore_async(user_id)
+        await call_auth_async("delete_user", user_id)
+        auth_user_cache.invalidate(user_id)
+        await delete_user_from_firestore_async(user_id)
+        user_search_index.remove(user_id)
+        if user_doc:
+            await adjust_user_counts_async({"total": -1, user_doc.get("status"): -1})
         logger.info(f"🗑️ User deleted: {user_id}")
         return {"message": "User deleted"}
     except Exception as e:
@@ -217,13 +632,17 @@ def delete_user_in_firebase(user_id: str):
         raise e
 
 # Firebase: Approve user
-def approve_user(user_id: str):
+async def approve_user(user_id: str):
     try:
         # Enable user in Firebase Authentication
-        auth.update_user(user_id, disabled=False)
+        await call_auth_async("update_user", user_id, disabled=False)
+        auth_user_cache.invalidate(user_id)
 
         # Update Firestore to reflect "approved" status
-        update_user_in_firestore(user_id, {"status": "active"})
+        user_doc = await get_user_from_firestore_async(user_id) or {}
+        await update_user_in_firestore_async(user_id, {"status": "active"})
+        user_search_index.upsert(user_id, {"status": "active"})
+        await adjust_user_counts_async(_status_change_deltas(user_doc.get("status"), "active"))
 
         logger.info(f"✅ User approved and re-enabled: {user_id}")
         return {"message": "User approved and re-enabled"}
@@ -232,13 +651,17 @@ def approve_user(user_id: str):
         raise e
 
 # Firebase: Put user on hold
-def hold_user(user_id: str):
+async def hold_user(user_id: str):
     try:
         # Disable user in Firebase Authentication
-        auth.update_user(user_id, disabled=True)
+        await call_auth_async("update_user", user_id, disabled=True)
+        auth_user_cache.invalidate(user_id)
 
         # Update Firestore to reflect "on_hold" status
-        update_user_in_firestore(user_id, {"status": "on_hold"})
+        user_doc = await get_user_from_firestore_async(user_id) or {}
+        await update_user_in_firestore_async(user_id, {"status": "on_hold"})
+        user_search_index.upsert(user_id, {"status": "on_hold"})
+        await adjust_user_counts_async(_status_change_deltas(user_doc.get("status"), "on_hold"))
 
         logger.info(f"⏸️ User put on hold and disabled: {user_id}")
         return {"message": "User put on hold and disabled"}
@@ -247,17 +670,17 @@ def hold_user(user_id: str):
         raise e
 
 # Firebase: Generate password reset link
-def generate_password_reset_link(email: str):
+async def generate_password_reset_link(email: str):
     try:
-        reset_link = auth.generate_password_reset_link(email)
-        user = get_user_by_email(email)
+        reset_link = await call_auth_async("generate_password_reset_link", email)
+        user = await get_user_by_email(email)
 
         # Get reset password email content
         subject, body = reset_password_email(user['users'][0]['first_name'], reset_link)
-        send_email(email, subject, body)
+        await queue_emails([(email, subject, body)])
 
         logger.info(f"📩 Password reset link generated for: {email}")
         return reset_link
     except Exception as e:
         logger.exception(f"❌ Error generating password reset link for: {email}")
-        raise e
+        raise e
\ No newline at end of file
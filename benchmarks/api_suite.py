@@ -0,0 +1,218 @@
+"""
+Latency of the main admin flows through the whole app: middleware, routers and
+services, driven over an in-process ASGI client with the lifespan running.
+Firebase Auth, Firestore and Resend are the in-memory fakes from
+benchmarks/fakes.py with injected round-trip latency; the admin database is a
+fresh SQLite file by default, or a local Postgres via --database-url.
+
+Each scenario (login, me, list, detail, update, create) runs --requests
+requests at --concurrency after a short warmup, and reports throughput and
+p50/p95/p99. Save a run with --output and check a later one against it with
+--compare, which exits non-zero when a scenario's p95 rose or its throughput
+fell by more than --tolerance.
+
+    python -m benchmarks.api_suite --output baseline.json
+    python -m benchmarks.api_suite --compare baseline.json --tolerance 0.15
+    python -m benchmarks.api_suite --database-url postgresql://postgres@127.0.0.1:5433/app --firestore-ms 20 --auth-ms 40
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import Latency, install, install_resend
+
+SCENARIOS = ("login", "me", "list", "detail", "update", "create")
+
+ADMIN_PASSWORD = "benchmark-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_admins(emails: list[str]):
+    """(Re)creates superadmins sharing ADMIN_PASSWORD, so reruns against Postgres start clean."""
+    from app.core.database import SessionLocal
+    from app.core.security import hash_password
+    from app.models.user import User, UserRole
+
+    with SessionLocal() as db:
+        db.query(User).filter(User.email.in_(emails)).delete(synchronize_session=False)
+        hashed = hash_password(ADMIN_PASSWORD)
+        db.add_all(User(email=email, hashed_password=hashed, role=UserRole.SUPERADMIN) for email in emails)
+        db.commit()
+
+
+def build_requests(name: str, uids: list[str], page_size: int, run_id: str):
+    """Endless (method, path, json) requests for a scenario; detail and update cycle through the seeded users."""
+    users = "/api/v1/users"
+    cycle = itertools.cycle(uids)
+    for i in itertools.count():
+        if name == "login":
+            yield "POST", "/api/v1/auth/login", {"email": "bench-login@example.com", "password": ADMIN_PASSWORD}
+        elif name == "me":
+            yield "GET", "/api/v1/auth/me", None
+        elif name == "list":
+            yield "GET", f"{users}/?limit={page_size}", None
+        elif name == "detail":
+            yield "GET", f"{users}/{next(cycle)}", None
+        elif name == "update":
+            yield "PUT", f"{users}/{next(cycle)}", {"first_name": f"Bench{i}"}
+        elif name == "create":
+            yield "POST", f"{users}/", {"email": f"bench-{run_id}-{i}@example.com", "first_name": "Bench"}
+
+
+async def run_scenario(client, requests, headers: dict, total: int, warmup: int, concurrency: int) -> dict:
+    async def send(request):
+        method, path, body = request
+        return await client.request(method, path, json=body, headers=headers)
+
+    for _ in range(warmup):
+        await send(next(requests))
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            request = next(requests)
+            started = time.perf_counter()
+            response = await send(request)
+            latencies.append(time.perf_counter() - started)
+            if not response.is_success:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def run(args, uids: list[str]) -> dict:
+    import httpx
+    from app.core.startup import startup
+    from app.main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        while not startup.complete:
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(create_admins, ["bench@example.com", "bench-login@example.com"])
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            # login gets its own admin: every login replaces that admin's session token
+            response = await client.post("/api/v1/auth/login", json={"email": "bench@example.com", "password": ADMIN_PASSWORD})
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            run_id = f"{int(time.time())}"
+            for name in args.scenarios:
+                total = min(args.requests, args.login_requests) if name == "login" else args.requests
+                requests = build_requests(name, uids, args.page_size, run_id)
+                results[name] = await run_scenario(client, requests, headers, total, args.warmup, args.concurrency)
+                print_row(name, results[name])
+    return results
+
+
+def print_row(name: str, result: dict):
+    print(
+        f"{name:<8} {result['rps']:>9.1f} req/s   p50 {result['p50_ms']:>8.2f}   p95 {result['p95_ms']:>8.2f}   "
+        f"p99 {result['p99_ms']:>8.2f} ms   errors {result['errors']}"
+    )
+
+
+def compare(baseline: dict, current: dict, config: dict, tolerance: float) -> bool:
+    """Prints p95 and throughput changes per scenario; True when any regressed beyond `tolerance`."""
+    regressed = False
+    print(f"\ncompared with {baseline.get('git_commit') or 'baseline'} ({tolerance:.0%} tolerance)")
+    differing = sorted(key for key, value in config.items() if baseline.get("config", {}).get(key) != value)
+    if differing:
+        print(f"note: the runs differ in {', '.join(differing)}")
+    for name, result in current.items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1
+        rps_change = result["rps"] / before["rps"] - 1
+        worse = p95_change > tolerance or rps_change < -tolerance
+        regressed |= worse
+        print(f"{name:<8} p95 {p95_change:>+7.1%}   req/s {rps_change:>+7.1%}   {'REGRESSED' if worse else 'ok'}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=100, help="Cap for login, which is bounded by bcrypt")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=1000, help="Seeded Firebase users")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--firestore-ms", type=float, default=5.0)
+    parser.add_argument("--auth-ms", type=float, default=20.0)
+    parser.add_argument("--resend-ms", type=float, default=50.0)
+    parser.add_argument("--database-url", help="Defaults to a new SQLite file")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+    os.environ.setdefault("SEARCH_INDEX_LISTENER", "false")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+    latency = Latency(firestore=args.firestore_ms / 1000, auth=args.auth_ms / 1000, resend=args.resend_ms / 1000)
+    fake = install(latency)
+    install_resend(latency)
+    uids = fake.seed_users(args.users)
+
+    with directory:
+        scenarios = asyncio.run(run(args, uids))
+
+    report = {
+        "timestamp": time.time(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(json.load(f), scenarios, report["config"], args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
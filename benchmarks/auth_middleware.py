@@ -0,0 +1,108 @@
+"""
+Compares the pure ASGI AuthMiddleware against the previous BaseHTTPMiddleware
+implementation, which ran the session query on the event loop.
+
+The database lookup is replaced by a blocking sleep of --db-latency-ms and the
+session cache is disabled, so every request pays the lookup.
+
+    python -m benchmarks.auth_middleware --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("BACKEND_CORS_ORIGINS", "[]")
+for _name in ("FIREBASE_CREDENTIALS", "FROM_SENDER_ADDRESS", "RESEND_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import middleware
+from app.core.middleware import AuthMiddleware
+from app.core.security import create_access_token
+from app.core.session_cache import AdminSnapshot, session_cache
+from app.models.user import UserRole
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The previous middleware: BaseHTTPMiddleware with a blocking lookup inside dispatch."""
+
+    async def dispatch(self, request: Request, call_next):
+        token = request.headers["Authorization"].split(" ")[1]
+        result = middleware.lookup_session("bench@example.com", token, None, session_cache.generation("bench@example.com"))
+        if isinstance(result, JSONResponse):
+            return result
+        request.state.user = result
+        return await call_next(request)
+
+
+def build_app(middleware_class) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_class)
+
+    @app.get("/me")
+    async def me(request: Request):
+        return {"email": request.state.user.email}
+
+    return app
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(app: FastAPI, token: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    queue = iter(range(total))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            for _ in queue:
+                started = time.perf_counter()
+                response = await client.get("/me", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    admin = AdminSnapshot(id=1, email="bench@example.com", role=UserRole.ADMIN)
+
+    def fake_lookup(email, token, token_exp, generation):
+        time.sleep(args.db_latency_ms / 1000)  # Simulated blocking Postgres round trip
+        return admin
+
+    middleware.lookup_session = fake_lookup
+    session_cache.get = lambda token: None  # Force every request through the lookup
+
+    token = create_access_token({"sub": admin.email})
+    for name, middleware_class in (("BaseHTTPMiddleware", LegacyAuthMiddleware), ("pure ASGI", AuthMiddleware)):
+        result = asyncio.run(run(build_app(middleware_class), token, args.requests, args.concurrency))
+        print(f"{name:<20} {result['rps']:>9.1f} req/s   p50 {result['p50_ms']:>8.2f} ms   p99 {result['p99_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Load generator built from the Bruno collection in bruno/firebase-dashboard-routes,
+so capacity tests send the same requests the team maintains there.
+
+Every .bru file becomes a route with a weight. Hosts in the files are
+ignored and requests go to --base-url, so a run never reaches a deployed
+instance by accident. The driver logs in once with login.bru (or
+--email/--password) and sends that token wherever a file uses bearer auth,
+replacing the stale tokens saved in the collection.
+
+Load is either a fixed request rate (--rps, open loop, latency measured from
+the scheduled send time) or a number of concurrent clients (--concurrency,
+closed loop). Giving several levels, e.g. `--rps 10 20 50 100`, runs them as
+steps. Each step reports per route latency percentiles and error rates, and
+the summary names the first step at which each route saturated: p95 above
+--slo-ms, errors above --max-error-rate, or the server falling behind the
+requested rate.
+
+Only read-only routes plus approve, hold and update carry weight by default.
+Logging in rotates the shared session token, and the other requests create,
+delete or email real accounts. Use --weight name=N to change this, and
+--replace to point the uids and emails saved in the collection at local data:
+
+    python -m benchmarks.bruno_load --rps 10 20 50 --duration 20
+    python -m benchmarks.bruno_load --concurrency 1 5 20 --weight hold_user=0 \\
+        --replace I6s7YWbREST9uemnq1sQkfThbiT2=uid0000001 --output load.json
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+DEFAULT_COLLECTION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bruno", "firebase-dashboard-routes")
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "options", "head")
+
+# Blocks holding free text rather than `key: value` lines
+TEXT_BLOCKS = re.compile(r"^(body(:.+)?|script:.+|tests|docs)$")
+
+# Weights for files not given with --weight; anything else in the collection defaults to 0
+DEFAULT_WEIGHTS = {
+    "list_users": 10,
+    "get_user_id": 5,
+    "get_user": 3,
+    "get_current": 3,
+    "get_admins": 1,
+    "update_user": 1,
+    "approve_user": 1,
+    "hold_user": 1,
+}
+
+
+def parse_bru(text: str) -> dict:
+    """Parses a .bru file into {block name: dict of enabled entries, or str for text blocks}."""
+    blocks = {}
+    lines = iter(text.splitlines())
+    for line in lines:
+        header = re.match(r"^(\S+)\s*\{\s*$", line)
+        if not header:
+            continue
+        name = header.group(1)
+        content = []
+        for inner in lines:
+            if inner.rstrip() == "}":  # Blocks close at column 0; nested braces are indented
+                break
+            content.append(inner[2:] if inner.startswith("  ") else inner)
+        if TEXT_BLOCKS.match(name):
+            blocks[name] = "\n".join(content).strip()
+            continue
+        entries = {}
+        for entry in content:
+            key, sep, value = entry.strip().partition(":")
+            if sep and not key.startswith("~"):  # A leading ~ marks a disabled entry
+                entries[key.strip()] = value.strip()
+        blocks[name] = entries
+    return blocks
+
+
+@dataclass
+class BruRequest:
+    name: str
+    method: str
+    path: str
+    query: list
+    headers: dict
+    body: Optional[str]
+    bearer: bool
+    weight: int = 0
+
+    @classmethod
+    def from_file(cls, path: str, collection_auth: str) -> Optional["BruRequest"]:
+        blocks = parse_bru(open(path, encoding="utf-8").read())
+        method = next((method for method in HTTP_METHODS if method in blocks), None)
+        if method is None:
+            return None  # collection.bru and folder.bru hold defaults, not requests
+        request = blocks[method]
+        url = request.get("url", "")
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query_keys = {key for key, _ in query}
+        query += [(key, value) for key, value in blocks.get("params:query", {}).items() if key not in query_keys]
+        body_type = request.get("body", "none")
+        auth = request.get("auth", "none")
+        return cls(
+            name=blocks.get("meta", {}).get("name") or os.path.splitext(os.path.basename(path))[0],
+            method=method.upper(),
+            path=parts.path or "/",
+            query=query,
+            headers=dict(blocks.get("headers", {})),
+            body=blocks.get(f"body:{body_type}") if body_type != "none" else None,
+            bearer=auth == "bearer" or (auth == "inherit" and collection_auth == "bearer"),
+        )
+
+
+def load_collection(directory: str, replacements: list) -> dict[str, BruRequest]:
+    collection_auth = "none"
+    if os.path.exists(os.path.join(directory, "collection.bru")):
+        collection_auth = parse_bru(open(os.path.join(directory, "collection.bru")).read()).get("auth", {}).get("mode", "none")
+    requests = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.bru"))):
+        request = BruRequest.from_file(path, collection_auth)
+        if request is None:
+            continue
+        for old, new in replacements:
+            request.path = request.path.replace(old, new)
+            request.query = [(key, value.replace(old, new)) for key, value in request.query]
+            request.body = request.body.replace(old, new) if request.body else request.body
+        requests[request.name] = request
+    return requests
+
+
+@dataclass
+class RouteStats:
+    latencies: list = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, seconds: float, status):
+        self.latencies.append(seconds)
+        self.statuses[status] += 1
+        if status == "exception" or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        ordered = sorted(self.latencies)
+        pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 2)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 1),
+            "error_rate": round(self.errors / count, 4),
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+        }
+
+
+class LoadRun:
+    def __init__(self, client: httpx.AsyncClient, routes: list[BruRequest], token: Optional[str], seed: int):
+        self.client = client
+        self.routes = routes
+        self.weights = [route.weight for route in routes]
+        self.token = token
+        self.random = random.Random(seed)
+        self.stats: dict[str, RouteStats] = defaultdict(RouteStats)
+
+    async def send(self, route: BruRequest, scheduled_at: float):
+        headers = dict(route.headers)
+        if route.bearer and self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if route.body is not None:
+            headers.setdefault("Content-Type", "application/json")
+        try:
+            response = await self.client.request(route.method, route.path, params=route.query, content=route.body, headers=headers)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = "exception"
+        self.stats[route.name].record(time.perf_counter() - scheduled_at, status)
+
+    def pick(self) -> BruRequest:
+        return self.random.choices(self.routes, self.weights)[0]
+
+    async def open_loop(self, rps: float, duration: float, max_in_flight: int) -> dict:
+        """Sends at a fixed rate; requests the client had no room for count as skipped."""
+        in_flight = set()
+        skipped = 0
+        started = time.perf_counter()
+        for i in range(int(rps * duration)):
+            scheduled_at = started + i / rps
+            await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+            if len(in_flight) >= max_in_flight:
+                skipped += 1
+                continue
+            task = asyncio.create_task(self.send(self.pick(), scheduled_at))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight)
+        return {"elapsed": time.perf_counter() - started, "skipped": skipped}
+
+    async def closed_loop(self, concurrency: int, duration: float) -> dict:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def client():
+            while time.perf_counter() < deadline:
+                await self.send(self.pick(), time.perf_counter())
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return {"elapsed": time.perf_counter() - started, "skipped": 0}
+
+
+async def login(client: httpx.AsyncClient, requests: dict, email: Optional[str], password: Optional[str]) -> str:
+    login_request = requests.get("login")
+    if login_request is None:
+        raise SystemExit("The collection has no login request")
+    credentials = json.loads(login_request.body or "{}")
+    credentials.update({key: value for key, value in (("email", email), ("password", password)) if value})
+    response = await client.request(login_request.method, login_request.path, json=credentials)
+    if not response.is_success:
+        raise SystemExit(f"Login as {credentials.get('email')} failed: {response.status_code} {response.text}")
+    return response.json()["access_token"]
+
+
+async def run(args, requests: dict) -> list[dict]:
+    routes = [route for route in requests.values() if route.weight > 0]
+    if not routes:
+        raise SystemExit("Every route has weight 0")
+    mode, levels = ("rps", args.rps) if args.rps else ("concurrency", args.concurrency)
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout, follow_redirects=True) as client:
+        token = await login(client, requests, args.email, args.password) if any(route.bearer for route in routes) else None
+        steps = []
+        for level in levels:
+            load = LoadRun(client, routes, token, args.seed)
+            if mode == "rps":
+                outcome = await load.open_loop(level, args.duration, args.max_in_flight)
+            else:
+                outcome = await load.closed_loop(int(level), args.duration)
+            total = sum(len(stats.latencies) for stats in load.stats.values())
+            step = {
+                mode: level,
+                "achieved_rps": round(total / outcome["elapsed"], 1),
+                "skipped": outcome["skipped"],
+                "routes": {name: stats.summary(outcome["elapsed"]) for name, stats in sorted(load.stats.items())},
+            }
+            steps.append(step)
+            print_step(mode, step)
+    return steps
+
+
+def print_step(mode: str, step: dict):
+    print(f"\n{mode} {step[mode]}: {step['achieved_rps']} req/s achieved, {step['skipped']} skipped")
+    print(f"{'route':<16} {'req':>6} {'req/s':>8} {'err %':>7} {'p50':>9} {'p95':>9} {'p99':>9}  statuses")
+    for name, route in step["routes"].items():
+        print(
+            f"{name:<16} {route['requests']:>6} {route['rps']:>8.1f} {route['error_rate'] * 100:>6.1f}% "
+            f"{route['p50_ms']:>9.1f} {route['p95_ms']:>9.1f} {route['p99_ms']:>9.1f}  {route['statuses']}"
+        )
+
+
+def saturation_points(mode: str, steps: list[dict], slo_ms: float, max_error_rate: float) -> dict:
+    """First load level at which each route breached the SLO or error budget, or the server fell behind."""
+    points = {}
+    for step in steps:
+        behind = step["skipped"] > 0 or (mode == "rps" and step["achieved_rps"] < 0.9 * step[mode])
+        for name, route in step["routes"].items():
+            if name in points:
+                continue
+            reasons = [
+                reason for reason, breached in (
+                    (f"p95 {route['p95_ms']:.0f} ms > {slo_ms:.0f} ms", route["p95_ms"] > slo_ms),
+                    (f"errors {route['error_rate']:.1%}", route["error_rate"] > max_error_rate),
+                    ("server behind the requested rate", behind),
+                ) if breached
+            ]
+            if reasons:
+                points[name] = {mode: step[mode], "reasons": reasons}
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, nargs="+", help="Request rates to step through (open loop)")
+    load.add_argument("--concurrency", type=int, nargs="+", default=[10], help="Concurrent clients to step through")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per step")
+    parser.add_argument("--weight", action="append", default=[], metavar="NAME=N", help="Override a route's weight")
+    parser.add_argument("--replace", action="append", default=[], metavar="OLD=NEW", help="Substitute text in paths, queries and bodies")
+    parser.add_argument("--email", help="Login email, instead of the one in login.bru")
+    parser.add_argument("--password", help="Login password, instead of the one in login.bru")
+    parser.add_argument("--slo-ms", type=float, default=500)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--list", action="store_true", help="Print the parsed routes and weights, then exit")
+    parser.add_argument("--output", help="Write every step and the saturation points as JSON to this file")
+    args = parser.parse_args()
+
+    requests = load_collection(args.collection, [tuple(pair.split("=", 1)) for pair in args.replace])
+    weights = {**DEFAULT_WEIGHTS, **{name: int(n) for name, n in (pair.split("=", 1) for pair in args.weight)}}
+    unknown = set(weights) - set(requests) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        parser.error(f"no such route in the collection: {', '.join(sorted(unknown))}")
+    for name, request in requests.items():
+        request.weight = weights.get(name, 0)
+
+    if args.list:
+        for request in sorted(requests.values(), key=lambda request: -request.weight):
+            query = "&".join(f"{key}={value}" for key, value in request.query)
+            print(f"{request.weight:>4}  {request.name:<26} {request.method:<7} {request.path}{'?' + query if query else ''}")
+        return
+
+    steps = asyncio.run(run(args, requests))
+    mode = "rps" if args.rps else "concurrency"
+    points = saturation_points(mode, steps, args.slo_ms, args.max_error_rate)
+    print("\nsaturation points")
+    for name in sorted({name for step in steps for name in step["routes"]}):
+        point = points.get(name)
+        print(f"{name:<16} " + (f"{mode} {point[mode]}: {'; '.join(point['reasons'])}" if point else "not reached"))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"timestamp": time.time(), "mode": mode, "config": vars(args), "steps": steps, "saturation": points}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares putting N providers on hold one at a time (hold_user per uid, as the
+dashboard does today) against a single set_users_status_bulk call, on
+in-memory Firebase backends with injected round-trip latency.
+
+    python -m benchmarks.bulk_status --users 200 --auth-ms 40 --firestore-ms 20
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import Latency, install
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--auth-ms", type=float, default=40.0, help="Firebase Auth REST round trip")
+    parser.add_argument("--firestore-ms", type=float, default=20.0, help="Firestore gRPC round trip")
+    args = parser.parse_args()
+
+    fake = install(Latency(firestore=args.firestore_ms / 1000, auth=args.auth_ms / 1000))
+    uids = fake.seed_users(args.users, on_hold_every=0)
+
+    from app.services.user_service import approve_user, hold_user, set_users_status_bulk
+
+    async def per_user_loop():
+        for uid in uids:
+            await hold_user(uid)
+
+    async def bulk():
+        summary = await set_users_status_bulk(uids, None, "hold")
+        assert summary["failed"] == 0, summary
+
+    async def reset():
+        await asyncio.gather(*(approve_user(uid) for uid in uids))
+
+    async def run():
+        results = []
+        for name, operation in (("per-user loop", per_user_loop), ("bulk endpoint", bulk)):
+            await reset()
+            started = time.perf_counter()
+            await operation()
+            elapsed = time.perf_counter() - started
+            results.append((name, elapsed))
+        return results
+
+    print(f"{args.users} users, Auth {args.auth_ms:.0f} ms, Firestore {args.firestore_ms:.0f} ms")
+    for name, elapsed in asyncio.run(run()):
+        print(f"{name:<14} {elapsed:>8.2f} s   {args.users / elapsed:>8.1f} users/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures provider lookups against in-memory Firebase backends with injected
+round-trip latency.
+
+- email, serial:   Auth get_user_by_email, then the Firestore document (previous path)
+- email, query:    one Firestore query on the `email` field (get_user_by_email)
+- uid, serial:     Auth get_user, then the Firestore document (previous path)
+- uid, concurrent: both calls at once (get_user_by_uid)
+
+The Auth user cache is cleared before every lookup.
+
+    python -m benchmarks.email_lookup --auth-ms 60 --firestore-ms 25
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.fakes import Latency, install
+
+
+async def timed(lookup, argument, iterations: int) -> float:
+    from app.core.auth_user_cache import auth_user_cache
+
+    samples = []
+    for _ in range(iterations):
+        auth_user_cache.clear()  # Measure round trips, not Auth user cache hits
+        started = time.perf_counter()
+        result = await lookup(argument)
+        samples.append(time.perf_counter() - started)
+        assert result, f"{lookup.__name__} found nothing for {argument}"
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auth-ms", type=float, default=60.0, help="Firebase Auth REST round trip")
+    parser.add_argument("--firestore-ms", type=float, default=25.0, help="Firestore gRPC round trip")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    fake = install(Latency(firestore=args.firestore_ms / 1000, auth=args.auth_ms / 1000))
+    uid = fake.seed_users(50)[7]
+    email = fake.auth.users[uid].email
+
+    from app.core.firebase import get_firebase_user_async, get_firebase_user_by_uid_async, get_user_from_firestore_async
+    from app.services.user_service import get_user_by_email, get_user_by_uid
+
+    async def serial_email_lookup(email):
+        firebase_user = await get_firebase_user_async(email)
+        return {"users": [await get_user_from_firestore_async(firebase_user.uid)]}
+
+    async def serial_uid_lookup(uid):
+        firebase_user = await get_firebase_user_by_uid_async(uid)
+        return await get_user_from_firestore_async(firebase_user.uid)
+
+    async def run():
+        return [
+            ("email, serial", await timed(serial_email_lookup, email, args.iterations)),
+            ("email, query", await timed(get_user_by_email, email, args.iterations)),
+            ("uid, serial", await timed(serial_uid_lookup, uid, args.iterations)),
+            ("uid, concurrent", await timed(get_user_by_uid, uid, args.iterations)),
+        ]
+
+    print(f"Auth {args.auth_ms:.0f} ms, Firestore {args.firestore_ms:.0f} ms, median of {args.iterations}")
+    for name, median_ms in asyncio.run(run()):
+        print(f"{name:<16} {median_ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,613 @@
+"""
+In-memory stand-ins for Firebase Auth, Firestore and Resend with injectable latency.
+
+`install()` must run before anything under `app` is imported: it patches the
+firebase_admin entry points the app uses so no credentials or network are
+needed, and returns the fake backends for seeding and inspection.
+`install_resend()` then points the email service's client at a fake Resend API.
+"""
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+import firebase_admin
+import httpx
+from firebase_admin import auth, credentials, firestore, firestore_async
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+
+# Settings the app requires at import time
+BENCH_ENV = {
+    "DATABASE_URL": "sqlite:///:memory:",
+    "BACKEND_CORS_ORIGINS": "[]",
+    "FIREBASE_CREDENTIALS": "benchmark",
+    "FROM_SENDER_ADDRESS": "bench@example.com",
+    "RESEND_API_KEY": "benchmark",
+}
+
+
+@dataclass
+class Latency:
+    """Simulated round-trip times in seconds."""
+    firestore: float = 0.0
+    auth: float = 0.0
+    resend: float = 0.0
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _apply(target: dict, data: dict):
+    for key, value in data.items():
+        if isinstance(value, transforms.Increment):
+            target[key] = target.get(key, 0) + value.value
+        elif value is transforms.DELETE_FIELD:
+            target.pop(key, None)
+        elif value is transforms.SERVER_TIMESTAMP:
+            target[key] = _now()
+        else:
+            target[key] = value
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data, update_time=None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self.update_time = update_time
+        self._data = None if data is None else dict(data)
+
+    def to_dict(self):
+        return None if self._data is None else dict(self._data)
+
+    def get(self, field):
+        return self._data.get(field)
+
+
+class FakeStore:
+    """Documents shared by the sync and async clients, keyed by collection then id."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.collections: dict[str, dict[str, dict]] = {}
+        self.update_times: dict[str, datetime.datetime] = {}
+        self.lock = threading.RLock()
+        self.rpc_count = 0
+        self.watches: list[tuple[str, object]] = []
+
+    def collection(self, name: str) -> dict:
+        return self.collections.setdefault(name, {})
+
+    def notify(self, reference, change_type: ChangeType, data: dict | None):
+        """Delivers one document change to its collection's and its own snapshot listeners, on the writer's thread."""
+        snapshot = FakeSnapshot(reference, data, self.update_times.get(reference.path))
+        for target, callback in list(self.watches):
+            if target in (reference._collection, reference.path):
+                callback([snapshot], [DocumentChange(change_type, snapshot, -1, -1)], _now())
+
+    def rpc(self):
+        self.rpc_count += 1
+
+
+class FakeDocumentReference:
+    def __init__(self, store: FakeStore, collection: str, doc_id: str):
+        self._store = store
+        self._collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    def _read(self):
+        with self._store.lock:
+            data = self._store.collection(self._collection).get(self.id)
+            return FakeSnapshot(self, data, self._store.update_times.get(self.path))
+
+    def _write(self, data: dict, merge: bool = False, must_exist: bool = False):
+        with self._store.lock:
+            documents = self._store.collection(self._collection)
+            if must_exist and self.id not in documents:
+                raise NotFound(f"No document to update: {self.path}")
+            existed = self.id in documents
+            if not merge and not must_exist:
+                documents[self.id] = {}
+            _apply(documents.setdefault(self.id, {}), data)
+            self._store.update_times[self.path] = _now()
+            self._store.notify(self, ChangeType.MODIFIED if existed else ChangeType.ADDED, documents[self.id])
+
+    def _delete(self):
+        with self._store.lock:
+            data = self._store.collection(self._collection).pop(self.id, None)
+            self._store.update_times.pop(self.path, None)
+            if data is not None:
+                self._store.notify(self, ChangeType.REMOVED, data)
+
+    def on_snapshot(self, callback):
+        """Sends the document as it is now, then every later write to it."""
+        with self._store.lock:
+            snapshot = self._read()
+            callback([snapshot], [], _now())
+            watch = (self.path, callback)
+            self._store.watches.append(watch)
+        return FakeWatch(self._store, watch)
+
+    def _wait(self):
+        self._store.rpc()
+        if self._store.latency.firestore:
+            time.sleep(self._store.latency.firestore)
+
+    def get(self, *args, **kwargs):
+        self._wait()
+        return self._read()
+
+    def set(self, data, merge=False):
+        self._wait()
+        self._write(data, merge=merge)
+
+    def update(self, data):
+        self._wait()
+        self._write(data, must_exist=True)
+
+    def delete(self):
+        self._wait()
+        self._delete()
+
+
+class FakeAsyncDocumentReference(FakeDocumentReference):
+    async def _wait(self):
+        self._store.rpc()
+        await asyncio.sleep(self._store.latency.firestore)
+
+    async def get(self, *args, **kwargs):
+        await self._wait()
+        return self._read()
+
+    async def set(self, data, merge=False):
+        await self._wait()
+        self._write(data, merge=merge)
+
+    async def update(self, data):
+        await self._wait()
+        self._write(data, must_exist=True)
+
+    async def delete(self):
+        await self._wait()
+        self._delete()
+
+
+class FakeQuery:
+    """Supports the query shapes the app builds: equality/in filters, ordering, cursors, limits and select()."""
+    document_class = FakeDocumentReference
+
+    def __init__(self, store, collection, filters=(), orders=(), limit=None, start_after=None, projection=None):
+        self._store = store
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._start_after = start_after
+        self._projection = projection
+
+    def _copy(self, **changes):
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit": self._limit,
+            "start_after": self._start_after,
+            "projection": self._projection,
+        }
+        state.update(changes)
+        return type(self)(self._store, self._collection, **state)
+
+    def document(self, doc_id=None):
+        return self.document_class(self._store, self._collection, doc_id or uuid.uuid4().hex[:20])
+
+    def where(self, field_path=None, op_string=None, value=None, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, values):
+        return self._copy(start_after=values)
+
+    def select(self, field_paths):
+        return self._copy(projection=tuple(field_paths))
+
+    def count(self, alias=None):
+        return FakeAggregation(self)
+
+    def _matches(self, data):
+        for field, op, value in self._filters:
+            if op == "==" and data.get(field) != value:
+                return False
+            if op == "in" and data.get(field) not in value:
+                return False
+        return True
+
+    def _key(self, data):
+        return tuple(data.get(field) or "" for field, _ in self._orders)
+
+    def _run(self):
+        with self._store.lock:
+            documents = self._store.collection(self._collection)
+            rows = [(doc_id, data) for doc_id, data in documents.items() if self._matches(data)]
+            if self._orders:
+                descending = self._orders[0][1] == "DESCENDING"
+                rows.sort(key=lambda row: self._key(row[1]), reverse=descending)
+                if self._start_after is not None:
+                    cursor = self._start_after
+                    cursor = cursor.to_dict() if isinstance(cursor, FakeSnapshot) else cursor
+                    bound = self._key(cursor)
+                    rows = [row for row in rows if (self._key(row[1]) < bound if descending else self._key(row[1]) > bound)]
+            if self._limit is not None:
+                rows = rows[:self._limit]
+            snapshots = []
+            for doc_id, data in rows:
+                if self._projection is not None:
+                    data = {field: data[field] for field in self._projection if field in data}
+                reference = self.document_class(self._store, self._collection, doc_id)
+                snapshots.append(FakeSnapshot(reference, data, self._store.update_times.get(reference.path)))
+            return snapshots
+
+    def stream(self):
+        self._store.rpc()
+        time.sleep(self._store.latency.firestore)
+        return iter(self._run())
+
+    def get(self):
+        return list(self.stream())
+
+    def on_snapshot(self, callback):
+        """Sends the current documents as ADDED, then every later write to the collection; filters are ignored."""
+        with self._store.lock:
+            snapshots = self._run()
+            callback(snapshots, [DocumentChange(ChangeType.ADDED, snapshot, -1, i) for i, snapshot in enumerate(snapshots)], _now())
+            watch = (self._collection, callback)
+            self._store.watches.append(watch)
+        return FakeWatch(self._store, watch)
+
+
+class FakeWatch:
+    def __init__(self, store, watch):
+        self._store = store
+        self._watch = watch
+
+    @property
+    def is_active(self):
+        with self._store.lock:
+            return self._watch in self._store.watches
+
+    def unsubscribe(self):
+        with self._store.lock:
+            if self._watch in self._store.watches:
+                self._store.watches.remove(self._watch)
+
+
+class FakeAsyncQuery(FakeQuery):
+    document_class = FakeAsyncDocumentReference
+
+    def count(self, alias=None):
+        return FakeAsyncAggregation(self)
+
+    async def stream(self):
+        self._store.rpc()
+        await asyncio.sleep(self._store.latency.firestore)
+        for snapshot in self._run():
+            yield snapshot
+
+    async def get(self):
+        return [snapshot async for snapshot in self.stream()]
+
+
+class _AggregationResult:
+    def __init__(self, value):
+        self.alias = "count"
+        self.value = value
+
+
+class FakeAggregation:
+    def __init__(self, query):
+        self._query = query
+
+    def get(self):
+        self._query._store.rpc()
+        time.sleep(self._query._store.latency.firestore)
+        return [[_AggregationResult(len(self._query._run()))]]
+
+
+class FakeAsyncAggregation(FakeAggregation):
+    async def get(self):
+        self._query._store.rpc()
+        await asyncio.sleep(self._query._store.latency.firestore)
+        return [[_AggregationResult(len(self._query._run()))]]
+
+
+class FakeWriteBatch:
+    MAX_WRITES = 500
+
+    def __init__(self, store):
+        self._store = store
+        self._writes = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def set(self, reference, data, merge=False):
+        self._writes.append(lambda: reference._write(data, merge=merge))
+
+    def update(self, reference, data):
+        self._writes.append(lambda: reference._write(data, must_exist=True))
+
+    def delete(self, reference):
+        self._writes.append(reference._delete)
+
+    def _commit(self):
+        if len(self._writes) > self.MAX_WRITES:
+            raise ValueError(f"A batch can contain at most {self.MAX_WRITES} writes")
+        with self._store.lock:
+            for write in self._writes:
+                write()
+        return []
+
+    def commit(self):
+        self._store.rpc()
+        time.sleep(self._store.latency.firestore)
+        return self._commit()
+
+
+class FakeAsyncWriteBatch(FakeWriteBatch):
+    async def commit(self):
+        self._store.rpc()
+        await asyncio.sleep(self._store.latency.firestore)
+        return self._commit()
+
+
+class FakeFirestoreClient:
+    query_class = FakeQuery
+    batch_class = FakeWriteBatch
+
+    def __init__(self, store: FakeStore):
+        self._store = store
+
+    def collection(self, name):
+        return self.query_class(self._store, name)
+
+    def batch(self):
+        return self.batch_class(self._store)
+
+    def get_all(self, references, field_paths=None):
+        self._store.rpc()
+        time.sleep(self._store.latency.firestore)
+        for reference in references:
+            yield reference._read()
+
+    def close(self):
+        pass
+
+
+class FakeAsyncFirestoreClient(FakeFirestoreClient):
+    query_class = FakeAsyncQuery
+    batch_class = FakeAsyncWriteBatch
+
+    async def get_all(self, references, field_paths=None):
+        self._store.rpc()
+        await asyncio.sleep(self._store.latency.firestore)
+        for reference in references:
+            yield reference._read()
+
+
+@dataclass
+class FakeUserRecord:
+    uid: str
+    email: str
+    disabled: bool = False
+    display_name: str | None = None
+    email_verified: bool = False
+
+
+class _FakeGetUsersResult:
+    def __init__(self, users, not_found):
+        self.users = users
+        self.not_found = not_found
+
+
+class _FakeDeleteUsersResult:
+    def __init__(self, success_count):
+        self.success_count = success_count
+        self.failure_count = 0
+        self.errors = []
+
+
+class FakeAuth:
+    """The subset of firebase_admin.auth used by the app. Calls are blocking, like the real REST client."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.users: dict[str, FakeUserRecord] = {}
+        self.lock = threading.RLock()
+        self.call_count = 0
+
+    def _call(self):
+        self.call_count += 1
+        if self.latency.auth:
+            time.sleep(self.latency.auth)
+
+    def _by_email(self, email):
+        return next((user for user in self.users.values() if user.email == email), None)
+
+    def get_user(self, uid, app=None):
+        self._call()
+        with self.lock:
+            if uid not in self.users:
+                raise auth.UserNotFoundError(f"No user record found for uid: {uid}")
+            return self.users[uid]
+
+    def get_user_by_email(self, email, app=None):
+        self._call()
+        with self.lock:
+            user = self._by_email(email)
+        if not user:
+            raise auth.UserNotFoundError(f"No user record found for email: {email}")
+        return user
+
+    def get_users(self, identifiers, app=None):
+        self._call()
+        if len(identifiers) > 100:
+            raise ValueError("`identifiers` parameter must have <= 100 entries.")
+        users, not_found = [], []
+        with self.lock:
+            for identifier in identifiers:
+                if isinstance(identifier, auth.UidIdentifier):
+                    user = self.users.get(identifier.uid)
+                else:
+                    user = self._by_email(identifier.email)
+                (users if user else not_found).append(user or identifier)
+        return _FakeGetUsersResult(users, not_found)
+
+    def create_user(self, uid=None, email=None, app=None, **kwargs):
+        self._call()
+        with self.lock:
+            if self._by_email(email):
+                raise auth.EmailAlreadyExistsError("The user with the provided email already exists", None, None)
+            uid = uid or uuid.uuid4().hex[:28]
+            self.users[uid] = FakeUserRecord(uid=uid, email=email)
+            return self.users[uid]
+
+    def update_user(self, uid, app=None, **kwargs):
+        self._call()
+        with self.lock:
+            if uid not in self.users:
+                raise auth.UserNotFoundError(f"No user record found for uid: {uid}")
+            for name, value in kwargs.items():
+                setattr(self.users[uid], name, value)
+            return self.users[uid]
+
+    def delete_user(self, uid, app=None):
+        self._call()
+        with self.lock:
+            if self.users.pop(uid, None) is None:
+                raise auth.UserNotFoundError(f"No user record found for uid: {uid}")
+
+    def delete_users(self, uids, app=None):
+        self._call()
+        if len(uids) > 1000:
+            raise ValueError("`uids` parameter must have <= 1000 entries.")
+        with self.lock:
+            for uid in uids:
+                self.users.pop(uid, None)
+        return _FakeDeleteUsersResult(len(uids))
+
+    def generate_password_reset_link(self, email, action_code_settings=None, app=None):
+        self._call()
+        return f"https://example.firebaseapp.com/__/auth/action?mode=resetPassword&email={email}"
+
+
+PATCHED_AUTH_FUNCTIONS = (
+    "get_user",
+    "get_user_by_email",
+    "get_users",
+    "create_user",
+    "update_user",
+    "delete_user",
+    "delete_users",
+    "generate_password_reset_link",
+)
+
+
+@dataclass
+class FakeFirebase:
+    latency: Latency
+    store: FakeStore
+    auth: FakeAuth
+    client: FakeFirestoreClient
+    async_client: FakeAsyncFirestoreClient
+
+    def seed_users(self, count: int, on_hold_every: int = 3) -> list[str]:
+        """Creates `count` provider accounts in both Auth and Firestore; returns their uids."""
+        uids = []
+        for index in range(count):
+            uid = f"uid{index:07d}"
+            email = f"provider{index}@clinic.example.com"
+            status = "on_hold" if on_hold_every and index % on_hold_every == 0 else "active"
+            self.auth.users[uid] = FakeUserRecord(uid=uid, email=email, disabled=status == "on_hold")
+            self.client.collection("users").document(uid)._write({
+                "uid": uid,
+                "email": email,
+                "first_name": f"First{index}",
+                "last_name": f"Last{index}",
+                "practice_name": f"Practice {index % 40}",
+                "npi": str(1_000_000_000 + index),
+                "status": status,
+                "notes": "Preferred contact by email. " * 4,
+            })
+            uids.append(uid)
+        return uids
+
+
+def install(latency: Latency | None = None) -> FakeFirebase:
+    """Patches firebase_admin to use in-memory backends and sets the env the app needs."""
+    for name, value in BENCH_ENV.items():
+        os.environ.setdefault(name, value)
+
+    latency = latency or Latency()
+    store = FakeStore(latency)
+    fake_auth = FakeAuth(latency)
+    fake = FakeFirebase(
+        latency=latency,
+        store=store,
+        auth=fake_auth,
+        client=FakeFirestoreClient(store),
+        async_client=FakeAsyncFirestoreClient(store),
+    )
+
+    credentials.Certificate = lambda *args, **kwargs: None
+    firebase_admin.initialize_app = lambda *args, **kwargs: firebase_admin._apps.setdefault("[DEFAULT]", object())
+    firestore.client = lambda *args, **kwargs: fake.client
+    firestore_async.client = lambda *args, **kwargs: fake.async_client
+    for name in PATCHED_AUTH_FUNCTIONS:
+        setattr(auth, name, getattr(fake_auth, name))
+    return fake
+
+
+class FakeResend:
+    """Accepts /emails and /emails/batch like Resend does, recording every message sent."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.sent: list[dict] = []
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        messages = payload if isinstance(payload, list) else [payload]
+        with self.lock:
+            self.requests += 1
+            self.sent.extend(messages)
+        ids = [{"id": str(uuid.uuid4())} for _ in messages]
+        return httpx.Response(200, json={"data": ids} if isinstance(payload, list) else ids[0])
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency.resend)
+        return self._respond(request)
+
+
+def install_resend(latency: Latency) -> FakeResend:
+    """Replaces the email service's pooled Resend client; call after `install()`."""
+    from app.services import email_service
+
+    resend = FakeResend(latency)
+    options = {"base_url": "https://resend.fake", "headers": {"Authorization": "Bearer benchmark"}}
+    email_service._async_client = httpx.AsyncClient(transport=httpx.MockTransport(resend.handle_async), **options)
+    return resend
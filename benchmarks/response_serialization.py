@@ -0,0 +1,83 @@
+"""
+Measures the cost of turning one users page into response bytes, the way
+FastAPI does it for each route:
+
+- before: JSONResponse (json.dumps); GET /users/ had no response_model, so
+          jsonable_encoder walked the page, while batch-get already had one
+- after:  the route's response_model serializes it in pydantic-core, then ORJSONResponse
+
+Pages come from list_users and get_users_batch against in-memory Firebase, so
+they hold exactly what the routes return. Gzipped sizes are those sent to
+clients sending Accept-Encoding: gzip.
+
+    python -m benchmarks.response_serialization --rows 100
+"""
+import argparse
+import asyncio
+import gzip
+import statistics
+import time
+
+from benchmarks.fakes import install
+
+
+async def timed(render, iterations: int) -> tuple[float, bytes]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = await render()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    fake = install()
+    uids = fake.seed_users(args.rows)
+
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import APIRoute, serialize_response
+    from app.api.users import router
+    from app.services.user_service import get_users_batch, list_users
+
+    def response_field(path: str, method: str):
+        route = next(r for r in router.routes if isinstance(r, APIRoute) and r.path == path and method in r.methods)
+        return route.response_field
+
+    # route: (response field before, response field after, page loader)
+    batch_field = response_field("/users/batch-get", "POST")
+    pages = {
+        "GET /users/": (None, response_field("/users/", "GET"), lambda: list_users(limit=args.rows)),
+        "POST /users/batch-get": (batch_field, batch_field, lambda: get_users_batch(uids, [])),
+    }
+
+    async def run():
+        results = []
+        for name, (before_field, after_field, load) in pages.items():
+            page = await load()
+
+            async def before():
+                return JSONResponse(await serialize_response(field=before_field, response_content=page)).body
+
+            async def after():
+                return ORJSONResponse(await serialize_response(field=after_field, response_content=page)).body
+
+            before_us, before_body = await timed(before, args.iterations)
+            after_us, after_body = await timed(after, args.iterations)
+            assert before_body.count(b'"uid"') == after_body.count(b'"uid"')
+            results.append((name, before_us, after_us, len(after_body), len(gzip.compress(after_body))))
+        return results
+
+    results = asyncio.run(run())
+    print(f"{args.rows} users per page, median of {args.iterations}")
+    print(f"{'route':<24} {'before us':>10} {'after us':>9} {'speedup':>8} {'bytes':>7} {'gzipped':>8}")
+    for name, before_us, after_us, size, gzipped in results:
+        print(f"{name:<24} {before_us:>10.0f} {after_us:>9.0f} {before_us / after_us:>7.1f}x {size:>7} {gzipped:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measures how quickly a session change published by one worker evicts the
+session from every other worker's cache over Postgres LISTEN/NOTIFY, and
+compares a cached session check with the per-request session query it replaces.
+Each simulated worker runs its own SessionBus and SessionCache in this process.
+
+Needs a reachable Postgres, e.g. `docker run -p 5432:5432 -e POSTGRES_PASSWORD=pw postgres`:
+
+    python -m benchmarks.session_revocation --database-url postgresql://postgres:pw@localhost/postgres
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.fakes import install
+
+
+async def wait_until(predicate, timeout: float = 5.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Timed out waiting for the session bus")
+        await asyncio.sleep(0.0005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), required=not os.getenv("DATABASE_URL"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    install()
+
+    from sqlalchemy import text
+    from starlette.concurrency import run_in_threadpool
+    from app.core.database import SessionLocal
+    from app.core.session_bus import SessionBus, publish_session_change
+    from app.core.session_cache import AdminSnapshot, SessionCache
+    from app.models.user import UserRole
+
+    admin = AdminSnapshot(id=1, email="bench-admin@example.com", role=UserRole.ADMIN)
+    token = "benchmark-token"
+
+    def publish():
+        with SessionLocal() as db:
+            publish_session_change(db, admin.email)
+            db.commit()
+
+    def query_session():
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1")).scalar()
+
+    async def run():
+        caches = [SessionCache(maxsize=16, ttl_seconds=300) for _ in range(args.workers)]
+        buses = [SessionBus(args.database_url, cache) for cache in caches]
+        tasks = [asyncio.create_task(bus.run()) for bus in buses]
+        await wait_until(lambda: all(cache.revocations_live for cache in caches))
+
+        propagation = []
+        for _ in range(args.rounds):
+            for cache in caches:
+                cache.put(token, admin, cache.generation(admin.email))
+            started = time.perf_counter()
+            await run_in_threadpool(publish)
+            await wait_until(lambda: all(cache.get(token) is None for cache in caches))
+            propagation.append(time.perf_counter() - started)
+
+        cached, queried = [], []
+        caches[0].put(token, admin, caches[0].generation(admin.email))
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            caches[0].get(token)
+            cached.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await run_in_threadpool(query_session)
+            queried.append(time.perf_counter() - started)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return propagation, cached, queried
+
+    def percentiles(samples):
+        samples = sorted(samples)
+        return (
+            statistics.median(samples) * 1000,
+            samples[int(len(samples) * 0.99) - 1] * 1000,
+            samples[-1] * 1000,
+        )
+
+    propagation, cached, queried = asyncio.run(run())
+    print(f"{args.workers} workers, {args.rounds} rounds")
+    print(f"{'':<26} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, samples in (
+        ("revocation, all workers", propagation),
+        ("cached session check", cached),
+        ("session query", queried),
+    ):
+        print(f"{name:<26} {'%9.3f %9.3f %9.3f' % percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
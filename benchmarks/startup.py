@@ -0,0 +1,89 @@
+"""
+Measures cold start in fresh interpreters: importing app.main, then running
+the lifespan until every backend has initialized (what /readyz waits for).
+Each run is a new process on in-memory Firebase and an empty SQLite file, so
+results only move when import or startup work changes; record them per
+release to track startup time over time.
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 10 --json >> startup-history.jsonl
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import BENCH_ENV
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+import_seconds = time.perf_counter() - started
+# Nothing initializes at import, so the fakes can be installed afterwards; this is
+# where firebase_admin gets imported, as the firebase step would do in production
+from benchmarks.fakes import install
+install()
+from app.core.startup import startup
+from fastapi.testclient import TestClient
+with TestClient(app):
+    while not startup.complete:
+        time.sleep(0.001)
+    ready_seconds = time.perf_counter() - started
+print(json.dumps({
+    "import": import_seconds,
+    "ready": ready_seconds,
+    "steps": {name: step["seconds"] for name, step in startup.stats()["steps"].items()},
+}))
+"""
+
+
+def run_once(database_path: str) -> dict:
+    env = {**BENCH_ENV, **os.environ, "DATABASE_URL": f"sqlite:///{database_path}", "OUTBOX_WORKER_ENABLED": "false", "SEARCH_INDEX_LISTENER": "false"}
+    if os.path.exists(database_path):
+        os.remove(database_path)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print one JSON summary line instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        runs = [run_once(os.path.join(directory, "startup.db")) for _ in range(args.runs)]
+
+    def median(key, step=None):
+        values = [run["steps"][step] if step else run[key] for run in runs]
+        return round(statistics.median(values), 3)
+
+    summary = {
+        "runs": args.runs,
+        "import_app_seconds": median("import"),
+        "ready_seconds": median("ready"),
+        "process_seconds": median("process"),
+        "steps_seconds": {step: median(None, step) for step in runs[0]["steps"]},
+    }
+    if args.json:
+        print(json.dumps({"timestamp": time.time(), **summary}))
+        return
+
+    print(f"median of {args.runs} cold starts (seconds)")
+    print(f"{'import app.main':<28} {summary['import_app_seconds']:>7.3f}")
+    print(f"{'ready (+ SDKs and lifespan)':<28} {summary['ready_seconds']:>7.3f}")
+    for step, seconds in summary["steps_seconds"].items():
+        print(f"{'  ' + step + ' init':<28} {seconds:>7.3f}")
+    print(f"{'process spawn to ready':<28} {summary['process_seconds']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
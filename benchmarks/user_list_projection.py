@@ -0,0 +1,113 @@
+"""
+Measures one 100-row users page with and without the select() projection.
+
+Provider documents are synthesised with the extra fields real ones carry.
+Each document is encoded into the RunQueryResponse protobuf that Firestore
+streams back, which gives the bytes on the wire. Decoding and row building is
+then traced with tracemalloc: the previous path decodes whole documents into
+per-row dicts, the projected path decodes only the listed fields into
+UserListRow.
+
+    python -m benchmarks.user_list_projection --rows 100
+"""
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.types import document, firestore
+
+from app.models.firebase_user import USER_LIST_FIELDS, UserListRow
+
+
+def provider_document(index: int) -> dict:
+    return {
+        "uid": f"uid{index:024d}",
+        "email": f"provider{index}@clinic.example.com",
+        "first_name": f"First{index}",
+        "last_name": f"Last{index}",
+        "practice_name": f"Practice {index % 40}",
+        "npi": str(1_000_000_000 + index),
+        "status": "active",
+        "phone": "+1 (713) 555-0100",
+        "address": {"line1": f"{index} Main Street", "city": "Houston", "state": "TX", "zip": "77001"},
+        "created_at": datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+        "notes": "Preferred contact by email. " * 8,
+        "recent_orders": [{"id": f"order-{index}-{n}", "panel": "micronutrient", "status": "complete"} for n in range(5)],
+    }
+
+
+def encode_page(documents: list[dict], fields: list[str] | None) -> list[bytes]:
+    responses = []
+    for data in documents:
+        if fields is not None:
+            data = {name: data[name] for name in fields if name in data}
+        pb = firestore.RunQueryResponse(
+            document=document.Document(
+                name=f"projects/p/databases/(default)/documents/users/{data['uid']}",
+                fields=_helpers.encode_dict(data),
+            )
+        )
+        responses.append(firestore.RunQueryResponse.serialize(pb))
+    return responses
+
+
+def legacy_rows(responses: list[bytes]) -> list[dict]:
+    users = []
+    for raw in responses:
+        user_data = _helpers.decode_dict(firestore.RunQueryResponse.deserialize(raw).document.fields, None)
+        users.append({
+            "uid": user_data.get("uid", "Unknown"),
+            "email": user_data.get("email", "Unknown"),
+            "first_name": user_data.get("first_name", "Unknown"),
+            "last_name": user_data.get("last_name", "Unknown"),
+            "practice_name": user_data.get("practice_name", "Unknown"),
+            "npi": user_data.get("npi", "Unknown"),
+            "status": user_data.get("status", "active")
+        })
+    return users
+
+
+def projected_rows(responses: list[bytes]) -> list[UserListRow]:
+    return [
+        UserListRow.from_dict(_helpers.decode_dict(firestore.RunQueryResponse.deserialize(raw).document.fields, None))
+        for raw in responses
+    ]
+
+
+def measure(build, responses: list[bytes], repeat: int) -> dict:
+    tracemalloc.start()
+    rows = build(responses)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        build(responses)
+    return {"retained": retained, "peak": peak, "us": (time.perf_counter() - started) / repeat * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    documents = [provider_document(index) for index in range(args.rows)]
+    full = encode_page(documents, None)
+    projected = encode_page(documents, USER_LIST_FIELDS)
+
+    print(f"{args.rows}-row page")
+    for name, responses, build in (("full documents", full, legacy_rows), ("select() + rows", projected, projected_rows)):
+        result = measure(build, responses, args.repeat)
+        wire = sum(len(raw) for raw in responses)
+        print(
+            f"{name:<16} wire {wire:>8,} B   retained {result['retained']:>8,} B   "
+            f"peak {result['peak']:>8,} B   build {result['us']:>8.0f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares finding providers by partial name, practice or NPI through the
+in-process search index against paging through the users list 100 rows at a
+time and filtering client-side, as support staff do today, on in-memory
+Firestore with injected round-trip latency.
+
+    python -m benchmarks.user_search --users 5000 --firestore-ms 25
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.fakes import Latency, install
+
+QUERIES = ("last42", "first12 last12", "1000004", "provider123@clinic.example.com", "clinic")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--firestore-ms", type=float, default=25.0, help="Firestore gRPC round trip")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    fake = install(Latency(firestore=args.firestore_ms / 1000))
+    fake.seed_users(args.users)
+
+    from app.core.config import settings
+    from app.core.firebase import get_users_from_firestore_async
+    from app.services.search_index import MIN_PREFIX, tokenize, user_search_index
+
+    settings.SEARCH_INDEX_LISTENER = False
+
+    async def page_through(query: str) -> int:
+        terms = [term for term in tokenize(query) if len(term) >= MIN_PREFIX]
+        found, last_uid = 0, None
+        while True:
+            page = await get_users_from_firestore_async(limit=100, last_uid=last_uid)
+            for row in page["users"]:
+                words = set().union(*(tokenize(value) for value in (row.first_name, row.last_name, row.practice_name, row.npi, row.email)))
+                if all(any(word.startswith(term) for word in words) for term in terms):
+                    found += 1
+            if not page["has_more"]:
+                return found
+            last_uid = page["next_page_uid"]
+
+    async def run():
+        started = time.perf_counter()
+        await user_search_index.build()
+        build_seconds = time.perf_counter() - started
+
+        results = []
+        for query in QUERIES:
+            started = time.perf_counter()
+            paged = await page_through(query)
+            paging_ms = (time.perf_counter() - started) * 1000
+
+            samples = []
+            for _ in range(args.iterations):
+                started = time.perf_counter()
+                indexed = user_search_index.search(query)["total_matches"]
+                samples.append(time.perf_counter() - started)
+            assert indexed == paged, (query, indexed, paged)
+            results.append((query, indexed, paging_ms, statistics.median(samples) * 1e6))
+        return build_seconds, results
+
+    build_seconds, results = asyncio.run(run())
+    print(f"{args.users} users, Firestore {args.firestore_ms:.0f} ms, index built in {build_seconds:.2f} s")
+    print(f"{'query':<32} {'matches':>8} {'paging ms':>10} {'index us':>9}")
+    for query, matches, paging_ms, index_us in results:
+        print(f"{query:<32} {matches:>8} {paging_ms:>10.0f} {index_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
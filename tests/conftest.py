@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# Settings are read on import, so the environment is set before anything from app/ loads
+_database_dir = tempfile.mkdtemp(prefix="app-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_database_dir, 'test.db')}",
+    DB_ASYNC="false",
+    OUTBOX_WORKER_ENABLED="false",
+    SEARCH_INDEX_LISTENER="false",
+    SESSION_BUS_ENABLED="false",
+    BCRYPT_ROUNDS="4",
+    LOG_LEVEL="WARNING",
+)
+
+# Firebase Auth and Firestore are the in-memory fakes the benchmarks use
+from benchmarks.fakes import install  # noqa: E402
+
+fake_firebase = install()
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.auth_user_cache import auth_user_cache  # noqa: E402
+from app.core.database import SessionLocal, init_db  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+init_db()
+
+SUPERADMIN_EMAIL = "superadmin@example.com"
+SUPERADMIN_PASSWORD = "test-password"
+
+
+@pytest.fixture
+def firebase():
+    """The Firebase fakes, emptied before each test."""
+    with fake_firebase.store.lock:
+        fake_firebase.store.collections.clear()
+        fake_firebase.store.update_times.clear()
+    fake_firebase.auth.users.clear()
+    auth_user_cache.clear()
+    return fake_firebase
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def superadmin_headers(client):
+    with SessionLocal() as db:
+        db.add(User(email=SUPERADMIN_EMAIL, hashed_password=hash_password(SUPERADMIN_PASSWORD), role=UserRole.SUPERADMIN))
+        db.commit()
+    response = client.post("/api/v1/auth/login", json={"email": SUPERADMIN_EMAIL, "password": SUPERADMIN_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from app.core.auth_user_cache import AuthUserCache
+
+
+def _record(uid: str = "uid1", email: str = "Provider@Example.com", disabled: bool = False):
+    return SimpleNamespace(uid=uid, email=email, disabled=disabled)
+
+
+def test_put_caches_by_uid_and_email():
+    cache = AuthUserCache(maxsize=8, ttl_seconds=60)
+    record = _record()
+
+    cache.put(record, cache.generation())
+
+    assert cache.get_by_uid("uid1") is record
+    assert cache.get_by_email("provider@example.com") is record
+
+
+def test_lookup_racing_an_invalidation_is_not_cached():
+    cache = AuthUserCache(maxsize=8, ttl_seconds=60)
+    generation = cache.generation()  # Lookup starts and reads the old record
+    cache.invalidate("uid1")  # Meanwhile the user is put on hold
+
+    cache.put(_record(), generation)
+
+    assert cache.get_by_uid("uid1") is None
+    assert cache.get_by_email("provider@example.com") is None
+
+
+def test_lookup_racing_a_clear_is_not_cached():
+    cache = AuthUserCache(maxsize=8, ttl_seconds=60)
+    generation = cache.generation()
+    cache.clear()
+
+    cache.put(_record(), generation)
+
+    assert cache.get_by_uid("uid1") is None
+
+
+def test_lookup_after_an_invalidation_is_cached():
+    cache = AuthUserCache(maxsize=8, ttl_seconds=60)
+    cache.put(_record(), cache.generation())
+    cache.invalidate("uid1")
+    fresh = _record(disabled=True)
+
+    cache.put(fresh, cache.generation())
+
+    assert cache.get_by_uid("uid1") is fresh
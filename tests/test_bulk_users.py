@@ -0,0 +1,74 @@
+from app.core import firebase as firebase_layer
+from app.services import user_service
+
+
+def _outcomes(response) -> dict:
+    return {result["uid"]: (result["ok"], result["error"]) for result in response.json()["results"]}
+
+
+def test_bulk_delete_reports_unknown_uids(client, superadmin_headers, firebase):
+    uids = firebase.seed_users(3)
+
+    response = client.post("/api/v1/users/bulk/delete", json={"uids": [uids[0], "ghost"]}, headers=superadmin_headers)
+
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 1
+    assert response.json()["failed"] == 1
+    assert _outcomes(response) == {uids[0]: (True, None), "ghost": (False, "User not found")}
+    assert uids[0] not in firebase.auth.users
+    assert uids[0] not in firebase.store.collection("users")
+    assert uids[1] in firebase.auth.users
+
+
+def test_bulk_status_updates_each_uid(client, superadmin_headers, firebase):
+    uids = firebase.seed_users(3)  # uids[0] starts on hold
+
+    response = client.post(
+        "/api/v1/users/bulk/status",
+        json={"uids": [uids[0], uids[1], "ghost"], "action": "hold"},
+        headers=superadmin_headers,
+    )
+
+    assert response.status_code == 200
+    assert _outcomes(response) == {uids[0]: (True, None), uids[1]: (True, None), "ghost": (False, "User not found")}
+    assert firebase.store.collection("users")[uids[1]]["status"] == "on_hold"
+    assert firebase.auth.users[uids[1]].disabled
+
+
+def test_bulk_create_reports_each_row(client, superadmin_headers, firebase):
+    users = [
+        {"email": "new-provider@example.com", "first_name": "New"},
+        {"email": "new-provider@example.com", "first_name": "Again"},
+    ]
+
+    response = client.post("/api/v1/users/bulk", json=users, headers=superadmin_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 1)
+    # Rows are created concurrently, so either one may take the email
+    created, rejected = sorted(body["results"], key=lambda result: not result["created"])
+    assert created["uid"] in firebase.auth.users and created["error"] is None
+    assert not rejected["created"] and rejected["error"]
+    assert {created["row"], rejected["row"]} == {0, 1}
+
+
+def test_bulk_filter_over_the_cap_is_rejected_after_a_bounded_read(client, superadmin_headers, firebase, monkeypatch):
+    firebase.seed_users(10, on_hold_every=0)
+    monkeypatch.setattr(user_service, "MAX_BULK_UPDATE", 3)
+    read = []
+
+    async def find_users(*args, **kwargs):
+        users = await firebase_layer.find_users_in_firestore_async(*args, **kwargs)
+        read.append(len(users))
+        return users
+
+    monkeypatch.setattr(user_service, "find_users_in_firestore_async", find_users)
+
+    response = client.post(
+        "/api/v1/users/bulk/status", json={"filter": {"status": "active"}, "action": "hold"}, headers=superadmin_headers
+    )
+
+    assert response.status_code == 400
+    assert read == [4]
+    assert all(doc["status"] == "active" for doc in firebase.store.collection("users").values())
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import pwd_context
+from app.core.database import DATABASE_URL, SessionLocal, run_db, to_async_url
+from app.core.security import generate_password_reset_token
+from app.core.session_cache import session_cache
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User, UserCreate
+from app.services.auth_service import save_session_token_async
+from app.services.user_service import (
+    create_admin_async,
+    delete_admin_by_email_async,
+    get_admin_by_email,
+    get_admin_by_email_async,
+    set_admin_password,
+)
+
+
+def _record(calls: list, name: str):
+    def call(db, *args, **kwargs):
+        calls.append((name, db, args, kwargs, threading.get_ident()))
+        return name
+    return call
+
+
+def _dispatch(db):
+    calls = []
+    sync_fn = _record(calls, "sync")
+    record_async = _record(calls, "async")
+
+    async def async_fn(db, *args, **kwargs):
+        return record_async(db, *args, **kwargs)
+
+    async def run():
+        return await run_db(sync_fn, async_fn, db, "uid1", status="active"), threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+    return result, loop_thread, calls
+
+
+def test_run_db_runs_sync_function_in_threadpool_for_sync_session():
+    db = Session()
+    result, loop_thread, calls = _dispatch(db)
+
+    assert result == "sync"
+    [(name, called_db, args, kwargs, thread)] = calls
+    assert (name, called_db, args, kwargs) == ("sync", db, ("uid1",), {"status": "active"})
+    assert thread != loop_thread
+
+
+def test_run_db_awaits_async_function_for_async_session():
+    db = AsyncSession()
+    result, loop_thread, calls = _dispatch(db)
+
+    assert result == "async"
+    [(name, called_db, args, kwargs, thread)] = calls
+    assert (name, called_db, args, kwargs) == ("async", db, ("uid1",), {"status": "active"})
+    assert thread == loop_thread
+
+
+# ---------------- ASYNC ADMIN DATA PATH (aiosqlite) ----------------
+
+def run_on_async_session(scenario):
+    """Runs `scenario(db)` on an AsyncSession over aiosqlite, against the test database."""
+    async def main():
+        engine = create_async_engine(to_async_url(DATABASE_URL))
+        try:
+            async with async_sessionmaker(engine, autoflush=False, expire_on_commit=False)() as db:
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+def _stored_admin(email: str) -> User | None:
+    with SessionLocal() as db:
+        return db.query(User).filter(User.email == email).first()
+
+
+@pytest.fixture
+def admin_email():
+    return f"admin-{uuid.uuid4().hex[:8]}@example.com"
+
+
+def test_async_engine_uses_aiosqlite():
+    assert to_async_url(DATABASE_URL).drivername == "sqlite+aiosqlite"
+
+
+def test_create_admin_async_stores_admin_and_queues_onboarding_email(admin_email):
+    created = run_on_async_session(lambda db: create_admin_async(db, UserCreate(email=admin_email)))
+
+    assert created.id is not None
+    assert _stored_admin(admin_email).id == created.id
+    with SessionLocal() as db:
+        assert db.query(EmailOutbox).filter(EmailOutbox.recipient == admin_email).count() == 1
+
+
+def test_get_admin_by_email_async_round_trip(admin_email):
+    run_on_async_session(lambda db: create_admin_async(db, UserCreate(email=admin_email)))
+
+    found = run_on_async_session(lambda db: get_admin_by_email_async(db, admin_email))
+    missing = run_on_async_session(lambda db: get_admin_by_email_async(db, "missing@example.com"))
+
+    assert found.email == admin_email
+    assert missing is None
+
+
+def test_run_db_on_real_sessions(admin_email):
+    run_on_async_session(lambda db: create_admin_async(db, UserCreate(email=admin_email)))
+
+    found_async = run_on_async_session(lambda db: run_db(get_admin_by_email, get_admin_by_email_async, db, admin_email))
+
+    async def on_sync_session():
+        with SessionLocal() as db:
+            return await run_db(get_admin_by_email, get_admin_by_email_async, db, admin_email)
+
+    found_sync = asyncio.run(on_sync_session())
+
+    assert found_async.email == found_sync.email == admin_email
+
+
+def test_save_session_token_async_persists_token_and_drops_cached_session(admin_email):
+    run_on_async_session(lambda db: create_admin_async(db, UserCreate(email=admin_email)))
+    generation = session_cache.generation(admin_email)
+
+    async def save(db):
+        admin = await get_admin_by_email_async(db, admin_email)
+        return await save_session_token_async(db, admin, "new-session-token")
+
+    assert run_on_async_session(save) is True
+    assert _stored_admin(admin_email).session_token == "new-session-token"
+    assert session_cache.generation(admin_email) != generation
+
+
+def test_set_admin_password_on_async_session(admin_email):
+    async def create_with_session(db):
+        admin = await create_admin_async(db, UserCreate(email=admin_email))
+        await save_session_token_async(db, admin, "old-session-token")
+
+    run_on_async_session(create_with_session)
+    token = generate_password_reset_token(admin_email)
+
+    run_on_async_session(lambda db: set_admin_password(db, token, "new-password"))
+
+    stored = _stored_admin(admin_email)
+    assert pwd_context.verify("new-password", stored.hashed_password)
+    assert stored.session_token is None  # Signed out everywhere
+
+
+def test_set_admin_password_rejects_unknown_admin():
+    token = generate_password_reset_token("missing@example.com")
+    with pytest.raises(HTTPException) as error:
+        run_on_async_session(lambda db: set_admin_password(db, token, "new-password"))
+    assert error.value.status_code == 404
+
+
+def test_delete_admin_by_email_async(admin_email):
+    run_on_async_session(lambda db: create_admin_async(db, UserCreate(email=admin_email)))
+
+    run_on_async_session(lambda db: delete_admin_by_email_async(db, admin_email))
+
+    assert _stored_admin(admin_email) is None
+    with pytest.raises(ValueError):
+        run_on_async_session(lambda db: delete_admin_by_email_async(db, admin_email))
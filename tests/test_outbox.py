@@ -0,0 +1,155 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services import email_service
+from app.services.outbox_service import (
+    claim_outbox_batch,
+    deliver_outbox_batch,
+    enqueue_emails,
+    record_outbox_results,
+)
+
+
+class ScriptedResend:
+    """Answers Resend requests with queued status codes (200 once the queue is empty), recording idempotency keys."""
+
+    def __init__(self):
+        self.statuses: list[int] = []
+        self.requests: list[tuple[str, str]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.path, request.headers["Idempotency-Key"]))
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return httpx.Response(status)
+        payload = json.loads(request.content)
+        if isinstance(payload, list):
+            return httpx.Response(200, json={"data": [{"id": "email"} for _ in payload]})
+        return httpx.Response(200, json={"id": "email"})
+
+
+@pytest.fixture
+def resend(monkeypatch):
+    scripted = ScriptedResend()
+    client = httpx.AsyncClient(base_url="https://resend.test", transport=httpx.MockTransport(scripted.handle))
+    monkeypatch.setattr(email_service, "_async_client", client)
+    monkeypatch.setattr(settings, "RESEND_MAX_RETRIES", 0)  # Leave retries to the outbox
+    return scripted
+
+
+@pytest.fixture
+def outbox():
+    with SessionLocal() as db:
+        db.query(EmailOutbox).delete()
+        db.commit()
+    return SessionLocal
+
+
+def _rows(session_factory) -> dict:
+    with session_factory() as db:
+        return {row.recipient: row for row in db.query(EmailOutbox)}
+
+
+def _make_due(session_factory):
+    with session_factory() as db:
+        db.query(EmailOutbox).update({"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+
+
+def _deliver(batch) -> dict:
+    outcomes = asyncio.run(deliver_outbox_batch(batch, time.monotonic() + 30))
+    record_outbox_results(outcomes)
+    return outcomes
+
+
+def test_claim_leases_messages_and_counts_the_attempt(outbox, resend):
+    with outbox() as db:
+        enqueue_emails(db, [("a@example.com", "Hi", "<p>a</p>"), ("b@example.com", "Hi", "<p>b</p>")])
+
+    batch = claim_outbox_batch(10)
+
+    assert [(recipient, attempt) for _, recipient, _, _, attempt in batch] == [("a@example.com", 1), ("b@example.com", 1)]
+    rows = _rows(outbox)
+    assert all(row.status == OutboxStatus.SENDING and row.attempts == 1 for row in rows.values())
+    assert claim_outbox_batch(10) == []  # Leased rows are not claimed again
+
+
+def test_failed_batch_backs_off_and_retries_each_message_under_its_own_key(outbox, resend):
+    with outbox() as db:
+        enqueue_emails(db, [("a@example.com", "Hi", "<p>a</p>"), ("b@example.com", "Hi", "<p>b</p>")])
+    resend.statuses = [503]
+
+    batch = claim_outbox_batch(10)
+    outcomes = _deliver(batch)
+
+    assert all(error for error in outcomes.values())
+    rows = _rows(outbox)
+    for row in rows.values():
+        assert row.status == OutboxStatus.PENDING
+        assert row.next_attempt_at > datetime.utcnow() + timedelta(seconds=settings.OUTBOX_RETRY_BASE_SECONDS - 5)
+    assert claim_outbox_batch(10) == []  # Not due until the backoff passes
+
+    _make_due(outbox)
+    with outbox() as db:
+        enqueue_emails(db, [("c@example.com", "Hi", "<p>c</p>")])  # A new message claimed with the retries
+    outcomes = _deliver(claim_outbox_batch(10))
+
+    assert all(error is None for error in outcomes.values())
+    assert {row.status for row in _rows(outbox).values()} == {OutboxStatus.SENT}
+    ids = {recipient: message_id for message_id, recipient, *_ in batch}
+    retried = sorted(key for path, key in resend.requests[1:] if path == "/emails")
+    assert retried == sorted(f"outbox-{message_id}" for message_id in ids.values())
+    assert [path for path, _ in resend.requests].count("/emails/batch") == 2
+
+
+def test_message_is_dead_lettered_after_max_attempts(outbox, resend, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    with outbox() as db:
+        enqueue_emails(db, [("a@example.com", "Hi", "<p>a</p>")])
+    resend.statuses = [503, 503]
+
+    _deliver(claim_outbox_batch(10))
+    assert _rows(outbox)["a@example.com"].status == OutboxStatus.PENDING
+    _make_due(outbox)
+    _deliver(claim_outbox_batch(10))
+
+    row = _rows(outbox)["a@example.com"]
+    assert (row.status, row.attempts) == (OutboxStatus.DEAD, 2)
+    assert row.last_error
+
+
+def test_expired_lease_at_max_attempts_is_dead_lettered_at_claim(outbox, resend, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    with outbox() as db:
+        enqueue_emails(db, [("a@example.com", "Hi", "<p>a</p>")])
+
+    for _ in range(2):
+        claim_outbox_batch(10)  # The worker died before recording a result
+        _make_due(outbox)
+
+    assert claim_outbox_batch(10) == []
+    row = _rows(outbox)["a@example.com"]
+    assert (row.status, row.attempts) == (OutboxStatus.DEAD, 2)
+    assert resend.requests == []
+
+
+def test_rejected_batch_falls_back_to_individual_sends(outbox, resend):
+    with outbox() as db:
+        enqueue_emails(db, [("a@example.com", "Hi", "<p>a</p>"), ("b@example.com", "Hi", "<p>b</p>")])
+    resend.statuses = [422, 200, 422]
+
+    batch = claim_outbox_batch(10)
+    outcomes = _deliver(batch)
+
+    ids = {recipient: message_id for message_id, recipient, *_ in batch}
+    assert outcomes[ids["a@example.com"]] is None
+    assert outcomes[ids["b@example.com"]]
+    assert sorted(key for path, key in resend.requests if path == "/emails") == sorted(f"outbox-{message_id}" for message_id in ids.values())
@@ -0,0 +1,48 @@
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import hash_password
+from app.models.user import User, UserRole
+
+# Own admin: logging in replaces the session token the other tests authenticate with
+LOGIN_EMAIL = "timing@example.com"
+LOGIN_PASSWORD = "timing-password"
+
+
+@pytest.fixture
+def server_timing(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+
+@pytest.fixture(scope="module")
+def login_admin():
+    with SessionLocal() as db:
+        db.add(User(email=LOGIN_EMAIL, hashed_password=hash_password(LOGIN_PASSWORD), role=UserRole.SUPERADMIN))
+        db.commit()
+
+
+def test_server_timing_is_off_by_default(client, superadmin_headers):
+    response = client.get("/api/v1/auth/me", headers=superadmin_headers)
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_is_sent_to_superadmins(client, superadmin_headers, server_timing):
+    response = client.get("/api/v1/auth/me", headers=superadmin_headers)
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+@pytest.mark.parametrize("email, password", [
+    (LOGIN_EMAIL, LOGIN_PASSWORD),
+    (LOGIN_EMAIL, "wrong-password"),
+    ("nobody@example.com", "wrong-password"),
+])
+def test_server_timing_is_not_sent_on_login(client, login_admin, server_timing, email, password):
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_is_not_sent_on_rejected_requests(client, server_timing):
+    assert "server-timing" not in client.get("/api/v1/auth/me").headers
+    assert "server-timing" not in client.get("/api/v1/auth/me", headers={"Authorization": "Bearer invalid"}).headers
+    assert "server-timing" not in client.get("/healthz").headers
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.search_index import UserSearchIndex
+
+
+def _build(index: UserSearchIndex):
+    async def build():
+        await index.build()
+    asyncio.run(build())
+
+
+@pytest.fixture
+def index():
+    search_index = UserSearchIndex()
+    yield search_index
+    search_index.stop()
+
+
+def test_listener_build_reads_the_collection_once(index, firebase, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_INDEX_LISTENER", True)
+    uids = firebase.seed_users(5)
+    reads = firebase.store.rpc_count
+
+    _build(index)
+
+    assert firebase.store.rpc_count == reads  # Filled from the listener's initial snapshot, no streamed read
+    assert index.ready and index.listening()
+    assert index.stats()["users"] == 5
+    assert index.search("First3")["users"][0].uid == uids[3]
+    assert index.document_version(uids[3]) is not None
+
+
+def test_listener_keeps_index_current_after_build(index, firebase, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_INDEX_LISTENER", True)
+    uids = firebase.seed_users(2)
+    _build(index)
+
+    firebase.client.collection("users").document(uids[0])._write({"first_name": "Renamed"}, merge=True)
+    firebase.client.collection("users").document(uids[1])._delete()
+
+    assert index.search("Renamed")["users"][0].uid == uids[0]
+    assert index.stats()["users"] == 1
+
+
+def test_build_without_listener_streams_the_collection(index, firebase, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_INDEX_LISTENER", False)
+    firebase.seed_users(3)
+    reads = firebase.store.rpc_count
+
+    _build(index)
+
+    assert firebase.store.rpc_count == reads + 1
+    assert index.stats()["users"] == 3
+    assert not index.listening()
@@ -0,0 +1,40 @@
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import (
+    PAGE_CURSOR_AUDIENCE,
+    create_access_token,
+    create_page_cursor,
+    verify_access_token,
+    verify_page_cursor,
+)
+
+
+def test_page_cursor_round_trip():
+    payload = verify_page_cursor(create_page_cursor("uid1", "active", "next"))
+    assert (payload["uid"], payload["status"], payload["dir"]) == ("uid1", "active", "next")
+
+
+def test_page_cursor_rejects_access_token():
+    token = create_access_token({"sub": "admin@example.com"})
+    with pytest.raises(HTTPException) as error:
+        verify_page_cursor(token)
+    assert error.value.status_code == 400
+
+
+def test_page_cursor_rejects_other_audience():
+    cursor = jwt.encode({"uid": "uid1", "dir": "next", "aud": "somewhere-else"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    with pytest.raises(HTTPException):
+        verify_page_cursor(cursor)
+
+
+def test_page_cursor_rejects_bad_direction():
+    cursor = jwt.encode({"uid": "uid1", "dir": "sideways", "aud": PAGE_CURSOR_AUDIENCE}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    with pytest.raises(HTTPException):
+        verify_page_cursor(cursor)
+
+
+def test_access_token_check_rejects_page_cursor():
+    assert verify_access_token(create_page_cursor("uid1", None, "next")) is None
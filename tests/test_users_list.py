@@ -0,0 +1,38 @@
+import json
+import warnings
+
+from app.models.firebase_user import UserListRow
+
+
+def _store_int_npi_user(firebase) -> str:
+    [uid] = firebase.seed_users(1, on_hold_every=0)
+    firebase.client.collection("users").document(uid)._write({"npi": 1234567890}, merge=True)
+    return uid
+
+
+def test_list_row_stringifies_npi():
+    assert UserListRow.from_dict({"npi": 1234567890}).npi == "1234567890"
+    assert UserListRow.from_dict({"npi": None}).npi is None
+    assert UserListRow.from_dict({}).npi == "Unknown"
+
+
+def test_list_returns_numeric_npi_as_string(client, superadmin_headers, firebase):
+    uid = _store_int_npi_user(firebase)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # pydantic's serializer warnings included
+        response = client.get("/api/v1/users/?limit=10", headers=superadmin_headers)
+
+    assert response.status_code == 200
+    [user] = response.json()["users"]
+    assert (user["uid"], user["npi"]) == (uid, "1234567890")
+
+
+def test_export_returns_numeric_npi_as_string(client, superadmin_headers, firebase):
+    _store_int_npi_user(firebase)
+
+    response = client.get("/api/v1/users/export?format=ndjson", headers=superadmin_headers)
+
+    assert response.status_code == 200
+    [user] = [json.loads(line) for line in response.text.splitlines()]
+    assert user["npi"] == "1234567890"